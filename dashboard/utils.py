@@ -7,12 +7,11 @@ import zipfile
 import pandas as pd
 
 from evaluators.statistical_tests import batch_compare_models
+from utils.dataset_splits import default_gt_path
 
 
 def resolve_gt_path(v_key: str) -> str:
-    if v_key == "v2":
-        return "data/sample_gt_v2.json"
-    return "data/sample_gt_v1.json" if os.path.exists("data/sample_gt_v1.json") else "data/sample_gt.json"
+    return default_gt_path(v_key)
 
 
 def has_optional_reproduction_assets() -> bool:
@@ -32,14 +31,31 @@ def file_signature(path: str):
     return (path, stat.st_mtime, stat.st_size)
 
 
+def _results_file_signatures(prefix: str):
+    """
+    (path, mtime, size) for every results/<prefix>*.json, sorted by path.
+    One scandir pass replaces a glob plus an exists() and stat() per file.
+    """
+    try:
+        entries = os.scandir("results")
+    except FileNotFoundError:
+        return ()
+    signatures = []
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                signatures.append((f"results/{name}", stat.st_mtime, stat.st_size))
+    return tuple(sorted(signatures))
+
+
 def result_file_signatures(v_key: str):
-    result_files = sorted(glob.glob(f"results/preds_{v_key}_*.json"))
-    return tuple(file_signature(path) for path in result_files)
+    return _results_file_signatures(f"preds_{v_key}_")
 
 
 def report_file_signatures(v_key: str):
-    report_files = sorted(glob.glob(f"results/report_{v_key}_*.json"))
-    return tuple(file_signature(path) for path in report_files)
+    return _results_file_signatures(f"report_{v_key}_")
 
 
 def save_report_file(v_key: str, model_id: str, report: dict):
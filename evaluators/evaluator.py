@@ -1,29 +1,26 @@
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 from evaluators.metrics import (
     calculate_cer, calculate_wer, calculate_ned, 
     calculate_precision_recall, calculate_exact_match, calculate_bow_f1
 )
+from evaluators.parallel import score_predictions
+from utils.json_io import load_json_cached
 from utils.normalization import normalize_text
 
 class OCREvaluator:
-    def __init__(self, ground_truth_path: str, normalize: bool = True):
-        with open(ground_truth_path, 'r', encoding='utf-8') as f:
-            self.gt_data = json.load(f)
+    # Per-sample detail fields averaged into the report (score matrix columns)
+    SUMMARY_METRICS = ("cer", "wer", "ned", "precision", "recall", "bow_f1", "exact_match")
+
+    def __init__(self, ground_truth_path: str, normalize: bool = True, n_workers: Optional[int] = 1):
         self.normalize = normalize
-        # Convert to dict for easy lookup
-        self.gt_dict = {item['file_name']: item['text'] for item in self.gt_data}
+        # Worker processes for large prediction lists (1 = serial, None or 0 = one per CPU).
+        self.n_workers = n_workers
+        # Index GT text by file name while decoding.
+        self.gt_dict = {item['file_name']: item['text'] for item in load_json_cached(ground_truth_path)}
 
-    def evaluate_results(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
-        total_cer = 0.0
-        total_wer = 0.0
-        total_ned = 0.0
-        total_precision = 0.0
-        total_recall = 0.0
-        total_bow_f1 = 0.0
-        exact_matches = 0
-        count = 0
-        
+    def _score_predictions(self, predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score each prediction that has a GT entry; returns per-sample details."""
         individual_results = []
 
         for pred in predictions:
@@ -53,16 +50,6 @@ class OCREvaluator:
                     bow_f1 = calculate_bow_f1(pred_text, gt_text)
                     exact_match = calculate_exact_match(pred_text, gt_text)
                 
-                total_cer += cer
-                total_wer += wer
-                total_ned += ned
-                total_precision += precision
-                total_recall += recall
-                total_bow_f1 += bow_f1
-                if exact_match:
-                    exact_matches += 1
-                count += 1
-                
                 individual_results.append({
                     "file_name": file_name,
                     "cer": cer,
@@ -74,22 +61,30 @@ class OCREvaluator:
                     "exact_match": exact_match
                 })
 
-        avg_cer = total_cer / count if count > 0 else 0
-        avg_wer = total_wer / count if count > 0 else 0
-        avg_ned = total_ned / count if count > 0 else 0
-        avg_precision = total_precision / count if count > 0 else 0
-        avg_recall = total_recall / count if count > 0 else 0
-        avg_bow_f1 = total_bow_f1 / count if count > 0 else 0
-        exact_match_acc = exact_matches / count if count > 0 else 0
+        return individual_results
+
+    def evaluate_results(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        individual_results = score_predictions(self, predictions, self.n_workers)
+        count = len(individual_results)
+
+        # Reduce a (samples x metrics) score matrix column-wise in one pass.
+        scores = np.array(
+            [[result[m] for m in self.SUMMARY_METRICS] for result in individual_results],
+            dtype=np.float64,
+        ).reshape(count, len(self.SUMMARY_METRICS))
+        if count > 0:
+            means = dict(zip(self.SUMMARY_METRICS, (scores.sum(axis=0) / count).tolist()))
+        else:
+            means = dict.fromkeys(self.SUMMARY_METRICS, 0)
 
         return {
-            "average_cer": avg_cer,
-            "average_wer": avg_wer,
-            "average_ned": avg_ned,
-            "average_precision": avg_precision,
-            "average_recall": avg_recall,
-            "average_bow_f1": avg_bow_f1,
-            "exact_match_accuracy": exact_match_acc,
+            "average_cer": means["cer"],
+            "average_wer": means["wer"],
+            "average_ned": means["ned"],
+            "average_precision": means["precision"],
+            "average_recall": means["recall"],
+            "average_bow_f1": means["bow_f1"],
+            "exact_match_accuracy": means["exact_match"],
             "sample_count": count,
             "details": individual_results
         }
@@ -1,7 +1,10 @@
 import json
 import re
-from typing import List, Dict, Any, Iterable, Tuple
+import numpy as np
+from typing import AbstractSet, List, Dict, Any, Iterable, Optional, Tuple
 from evaluators.metrics import calculate_cer, calculate_wer, calculate_ned
+from evaluators.parallel import score_predictions
+from utils.json_io import load_json_cached
 from utils.normalization import normalize_text
 
 class OCREvaluatorV2:
@@ -46,19 +49,62 @@ class OCREvaluatorV2:
         "药物": "DRUGS"
     }
 
+    # One-pass test for whether a key contains any mapped phrase. Most keys contain
+    # none and skip the per-phrase replace loop in _map_key_phrases entirely.
+    KEY_MAPPING_PATTERN = re.compile("|".join(map(re.escape, KEY_MAPPING)))
+
     YN_TRUE = {"Y", "YES", "T", "TRUE", "CHECKED", "V", "✓", "✔"}
     YN_FALSE = {"N", "NO", "F", "FALSE", "UNCHECKED", "X", "✗", "✘"}
 
+    # Per-sample detail fields averaged into the report (score matrix columns)
+    SUMMARY_METRICS = ("yn_acc", "handwriting_cer", "handwriting_wer", "handwriting_ned", "weighted_score")
+
+    # GT item fields consumed by evaluation (new format plus legacy fallbacks)
+    GT_FIELDS = (
+        "file_name",
+        "yn_options",
+        "logical_values",
+        "disease_status",
+        "handwriting_text",
+        "medical_entities",
+        "field_pairings",
+    )
+
     def __init__(
         self,
         ground_truth_path: str,
         weights: Dict[str, float] = None,
-        enable_postprocess: bool = True
+        enable_postprocess: bool = True,
+        n_workers: Optional[int] = 1
     ):
-        with open(ground_truth_path, 'r', encoding='utf-8') as f:
-            self.gt_data = json.load(f)
-        self.gt_dict = {item['file_name']: item for item in self.gt_data}
+        # Index GT by file name, keeping only the fields the evaluator reads.
+        self.gt_dict = {
+            item['file_name']: {k: item[k] for k in self.GT_FIELDS if k in item}
+            for item in load_json_cached(ground_truth_path)
+        }
         self.enable_postprocess = enable_postprocess
+        # Resolve mode-dependent Y/N handling once: a direct value -> Y/N lookup
+        # table and the prediction keys searched for the Y/N options dict.
+        if enable_postprocess:
+            self._yn_lookup = {v: "Y" for v in self.YN_TRUE}
+            self._yn_lookup.update({v: "N" for v in self.YN_FALSE})
+            self._yn_source_keys = ("yn_options", "logical_values", "disease_status", "options")
+        else:
+            self._yn_lookup = {"Y": "Y", "N": "N"}
+            self._yn_source_keys = ("yn_options",)
+        # Worker processes for large prediction lists (1 = serial, None or 0 = one per CPU).
+        self.n_workers = n_workers
+        # GT question labels repeat across every document, so normalize each
+        # distinct label once and look its variants (and their n-gram sets for
+        # semantic matching) up by name while scoring.
+        self._gt_key_variants = {}
+        self._gt_key_ngrams = {}
+        for gt in self.gt_dict.values():
+            for k in self._gt_yn_options(gt):
+                if k not in self._gt_key_variants:
+                    variants = self._normalize_key_variants(k)
+                    self._gt_key_variants[k] = variants
+                    self._gt_key_ngrams[k] = tuple(frozenset(self._ngram_set(v)) for v in variants)
         
         # Default weights for overall score calculation
         if weights is None:
@@ -80,6 +126,20 @@ class OCREvaluatorV2:
             return normalize_text(key, strict_semantic=True)
         return key
 
+    def _map_key_phrases(self, key: str) -> str:
+        """
+        Map a whole key, or else each mapped phrase embedded in it (replaced one
+        after another in KEY_MAPPING order), to English.
+        """
+        if key in self.KEY_MAPPING:
+            return self.KEY_MAPPING[key]
+        if not self.KEY_MAPPING_PATTERN.search(key):
+            return key
+        for k, v in self.KEY_MAPPING.items():
+            if k in key:
+                key = key.replace(k, v)
+        return key
+
     def _strip_leading_enum(self, key: str) -> str:
         """Strip leading enumeration like '1.', 'Q1', '1)'."""
         return re.sub(r'^\s*(?:[A-Z]\d+|Q\d+|\d+)[\s\.:、\)\-]*', '', key, flags=re.IGNORECASE)
@@ -90,12 +150,7 @@ class OCREvaluatorV2:
             return ("", "")
         key = str(key).strip()
         if self.enable_postprocess:
-            if key in self.KEY_MAPPING:
-                key = self.KEY_MAPPING[key]
-            else:
-                for k, v in self.KEY_MAPPING.items():
-                    if k and k in key:
-                        key = key.replace(k, v)
+            key = self._map_key_phrases(key)
             key = self._strip_leading_enum(key)
             full_norm = normalize_text(key, remove_punctuation=True, strict_semantic=False)
             full_norm = full_norm.replace(" ", "")
@@ -118,37 +173,59 @@ class OCREvaluatorV2:
             return 0.0
         if a == b:
             return 1.0
-        a_set = self._ngram_set(a, n=2)
-        b_set = self._ngram_set(b, n=2)
+        return self._jaccard(self._ngram_set(a, n=2), self._ngram_set(b, n=2))
+
+    def _jaccard(self, a_set: AbstractSet[str], b_set: AbstractSet[str]) -> float:
         if not a_set or not b_set:
             return 0.0
         inter = len(a_set & b_set)
         union = len(a_set | b_set)
         return inter / union if union else 0.0
 
+    def _index_pred_entries(
+        self,
+        pred_entries: List[Tuple[str, Any, Tuple[str, str]]]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Map each non-empty normalized variant to the first entry index carrying it."""
+        full_index = {}
+        ascii_index = {}
+        for idx, (_, _, (p_full, p_ascii)) in enumerate(pred_entries):
+            if p_full:
+                full_index.setdefault(p_full, idx)
+            if p_ascii:
+                ascii_index.setdefault(p_ascii, idx)
+        return full_index, ascii_index
+
     def _find_pred_value(
         self,
         gt_key: str,
-        pred_entries: Iterable[Tuple[str, Any, Tuple[str, str]]]
+        pred_entries: Iterable[Tuple[str, Any, Tuple[str, str]]],
+        entry_index: Tuple[Dict[str, int], Dict[str, int]] = None
     ) -> Tuple[Any, str, float]:
         """Find best matching pred value for a GT key using fuzzy matching."""
-        gt_full, gt_ascii = self._normalize_key_variants(gt_key)
+        variants = self._gt_key_variants.get(gt_key)
+        if variants is None:
+            variants = self._normalize_key_variants(gt_key)
+        gt_full, gt_ascii = variants
         if not gt_full and not gt_ascii:
             return None, "", 0.0
+        if not isinstance(pred_entries, list):
+            pred_entries = list(pred_entries)
+        if entry_index is None:
+            entry_index = self._index_pred_entries(pred_entries)
+        # 1) Exact match on normalized variants via hash lookup. The earliest
+        # matching entry wins, with the full variant preferred on ties.
+        full_idx = entry_index[0].get(gt_full) if gt_full else None
+        ascii_idx = entry_index[1].get(gt_ascii) if gt_ascii else None
+        if full_idx is not None and (ascii_idx is None or full_idx <= ascii_idx):
+            match_type = "exact_full" if self.enable_postprocess else "exact_raw"
+            return pred_entries[full_idx][1], match_type, 1.0
+        if ascii_idx is not None:
+            match_type = "exact_ascii" if self.enable_postprocess else "exact_raw"
+            return pred_entries[ascii_idx][1], match_type, 1.0
         if not self.enable_postprocess:
             # Ablation mode: exact key matching only (after minimal trim/uppercase).
-            for _, value, (p_full, p_ascii) in pred_entries:
-                if gt_full and p_full and gt_full == p_full:
-                    return value, "exact_raw", 1.0
-                if gt_ascii and p_ascii and gt_ascii == p_ascii:
-                    return value, "exact_raw", 1.0
             return None, "", 0.0
-        # 1) Exact match on normalized variants
-        for _, value, (p_full, p_ascii) in pred_entries:
-            if gt_full and p_full and gt_full == p_full:
-                return value, "exact_full", 1.0
-            if gt_ascii and p_ascii and gt_ascii == p_ascii:
-                return value, "exact_ascii", 1.0
         # 2) Substring match on ASCII (guard with length to avoid collisions)
         if gt_ascii and len(gt_ascii) >= 4:
             for _, value, (_, p_ascii) in pred_entries:
@@ -160,11 +237,15 @@ class OCREvaluatorV2:
                 if p_full and (gt_full in p_full or p_full in gt_full):
                     return value, "substr_full", 0.9
         # 4) Semantic approximate matching (Jaccard n-grams)
+        gt_grams = self._gt_key_ngrams.get(gt_key)
+        if gt_grams is None:
+            gt_grams = (self._ngram_set(gt_full), self._ngram_set(gt_ascii))
+        gt_full_grams, gt_ascii_grams = gt_grams
         best_score = 0.0
         best_value = None
         for _, value, (p_full, p_ascii) in pred_entries:
-            score_full = self._similarity_score(gt_full, p_full) if gt_full and p_full else 0.0
-            score_ascii = self._similarity_score(gt_ascii, p_ascii) if gt_ascii and p_ascii else 0.0
+            score_full = self._jaccard(gt_full_grams, self._ngram_set(p_full)) if gt_full and p_full else 0.0
+            score_ascii = self._jaccard(gt_ascii_grams, self._ngram_set(p_ascii)) if gt_ascii and p_ascii else 0.0
             score = max(score_full, score_ascii)
             if score > best_score:
                 best_score = score
@@ -177,14 +258,7 @@ class OCREvaluatorV2:
         """Normalize a Y/N-like value to 'Y' or 'N'."""
         if value is None:
             return ""
-        val = str(value).strip().upper()
-        if not self.enable_postprocess:
-            return val if val in {"Y", "N"} else ""
-        if val in self.YN_TRUE:
-            return "Y"
-        if val in self.YN_FALSE:
-            return "N"
-        return val if val in {"Y", "N"} else ""
+        return self._yn_lookup.get(str(value).strip().upper(), "")
 
     def _parse_prediction(self, raw_pred: Any) -> Dict[str, Any]:
         """Parse prediction into a dict, stripping markdown if needed."""
@@ -200,6 +274,15 @@ class OCREvaluatorV2:
         except Exception:
             return {}
 
+    def _gt_yn_options(self, gt: Dict[str, Any]) -> Dict[str, Any]:
+        """GT Y/N targets (new format first, fallback to legacy fields)."""
+        if isinstance(gt.get("yn_options"), dict):
+            return gt["yn_options"]
+        gt_yn = {}
+        gt_yn.update(gt.get('logical_values', {}))
+        gt_yn.update(gt.get('disease_status', {}))
+        return gt_yn
+
     def _build_gt_handwriting_text(self, gt: Dict[str, Any]) -> str:
         """Combine GT handwritten content into a single text block."""
         if gt.get("handwriting_text") is not None:
@@ -232,34 +315,22 @@ class OCREvaluatorV2:
 
     def _extract_yn_options_from_pred(self, pred_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract Y/N options dict from prediction with fallbacks."""
-        keys = ("yn_options", "logical_values", "disease_status", "options")
-        if not self.enable_postprocess:
-            keys = ("yn_options",)
-        for key in keys:
+        for key in self._yn_source_keys:
             value = pred_data.get(key)
             if isinstance(value, dict):
                 return value
         return {}
 
-    def evaluate_results(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
-        total_yn_acc = 0.0
-        total_handwriting_cer = 0.0
-        total_handwriting_wer = 0.0
-        total_handwriting_ned = 0.0
-        total_weighted_score = 0.0
-        yn_tp = 0
-        yn_tn = 0
-        yn_fp = 0
-        yn_fn = 0
-        yn_missing_pos = 0
-        yn_missing_neg = 0
-        count = 0
-        
-        individual_results = []
-        question_stats = {}
-        field_errors = {
-            'yn_options': {'correct': 0, 'total': 0}
-        }
+    def _score_predictions(self, predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score each prediction that has a GT entry.
+        Each result carries the per-sample detail row, Y/N confusion counts,
+        and per-question outcomes as (label, is_correct, match_type).
+        """
+        results = []
+        # Resolve score weights once instead of per document.
+        yn_weight = self.weights['yn_accuracy']
+        handwriting_weight = self.weights['handwriting_score']
 
         for pred in predictions:
             file_name = pred['file_name']
@@ -269,13 +340,7 @@ class OCREvaluatorV2:
             gt = self.gt_dict[file_name]
             pred_data = self._parse_prediction(pred.get('prediction', {}))
 
-            # Build GT targets (new format first, fallback to legacy fields)
-            if isinstance(gt.get("yn_options"), dict):
-                gt_yn = gt.get("yn_options", {})
-            else:
-                gt_yn = {}
-                gt_yn.update(gt.get('logical_values', {}))
-                gt_yn.update(gt.get('disease_status', {}))
+            gt_yn = self._gt_yn_options(gt)
             gt_handwriting = self._build_gt_handwriting_text(gt)
 
             # Extract predictions
@@ -286,43 +351,37 @@ class OCREvaluatorV2:
             pred_entries = []
             for k, v in pred_yn_raw.items():
                 pred_entries.append((k, v, self._normalize_key_variants(k)))
+            entry_index = self._index_pred_entries(pred_entries)
 
             # 1) Y/N accuracy
+            yn_counts = {"tp": 0, "tn": 0, "fp": 0, "fn": 0, "missing_pos": 0, "missing_neg": 0}
+            questions = []
             yn_match = 0
             for k, v in gt_yn.items():
-                pred_v, match_type, match_score = self._find_pred_value(k, pred_entries)
+                pred_v, match_type, match_score = self._find_pred_value(k, pred_entries, entry_index)
                 gv = self._normalize_yn(v)
                 pv = self._normalize_yn(pred_v)
                 is_correct = bool(gv and pv and gv == pv)
                 if is_correct:
                     yn_match += 1
-                field_errors['yn_options']['total'] += 1
 
                 gt_is_pos = gv == "Y"
                 if pv not in {"Y", "N"}:
                     if gt_is_pos:
-                        yn_missing_pos += 1
+                        yn_counts["missing_pos"] += 1
                     else:
-                        yn_missing_neg += 1
+                        yn_counts["missing_neg"] += 1
                 elif gt_is_pos and pv == "Y":
-                    yn_tp += 1
+                    yn_counts["tp"] += 1
                 elif gt_is_pos and pv == "N":
-                    yn_fn += 1
+                    yn_counts["fn"] += 1
                 elif (not gt_is_pos) and pv == "Y":
-                    yn_fp += 1
+                    yn_counts["fp"] += 1
                 else:
-                    yn_tn += 1
+                    yn_counts["tn"] += 1
 
-                # Track per-question error stats
-                if k not in question_stats:
-                    question_stats[k] = {"correct": 0, "total": 0, "match_types": {}}
-                question_stats[k]["total"] += 1
-                if is_correct:
-                    question_stats[k]["correct"] += 1
-                if match_type:
-                    question_stats[k]["match_types"][match_type] = question_stats[k]["match_types"].get(match_type, 0) + 1
+                questions.append((k, is_correct, match_type))
             yn_acc = yn_match / len(gt_yn) if gt_yn else 0.0
-            field_errors['yn_options']['correct'] += yn_match
 
             # 2) Handwriting text metrics
             gt_text = normalize_text(gt_handwriting, remove_punctuation=True)
@@ -340,28 +399,75 @@ class OCREvaluatorV2:
             # Weighted score is computed per sample using a clipped handwriting
             # similarity so that CER values above 1 do not make the score negative.
             handwriting_score = max(0.0, 1.0 - cer)
-            weighted_score = (
-                yn_acc * self.weights['yn_accuracy'] +
-                handwriting_score * self.weights['handwriting_score']
-            )
-
-            total_yn_acc += yn_acc
-            total_handwriting_cer += cer
-            total_handwriting_wer += wer
-            total_handwriting_ned += ned
-            total_weighted_score += weighted_score
-            count += 1
-
-            individual_results.append({
-                "file_name": file_name,
-                "yn_acc": yn_acc,
-                "handwriting_cer": cer,
-                "handwriting_wer": wer,
-                "handwriting_ned": ned,
-                "weighted_score": weighted_score
+            weighted_score = yn_acc * yn_weight + handwriting_score * handwriting_weight
+
+            results.append({
+                "detail": {
+                    "file_name": file_name,
+                    "yn_acc": yn_acc,
+                    "handwriting_cer": cer,
+                    "handwriting_wer": wer,
+                    "handwriting_ned": ned,
+                    "weighted_score": weighted_score
+                },
+                "yn_correct": yn_match,
+                "yn_total": len(gt_yn),
+                "yn_counts": yn_counts,
+                "questions": questions,
             })
 
-        yn_accuracy = field_errors['yn_options']['correct'] / field_errors['yn_options']['total'] if field_errors['yn_options']['total'] > 0 else 0
+        return results
+
+    def evaluate_results(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        yn_tp = 0
+        yn_tn = 0
+        yn_fp = 0
+        yn_fn = 0
+        yn_missing_pos = 0
+        yn_missing_neg = 0
+        
+        individual_results = []
+        question_stats = {}
+        yn_field = {'correct': 0, 'total': 0}
+
+        for result in score_predictions(self, predictions, self.n_workers):
+            detail = result["detail"]
+            yn_counts = result["yn_counts"]
+            yn_tp += yn_counts["tp"]
+            yn_tn += yn_counts["tn"]
+            yn_fp += yn_counts["fp"]
+            yn_fn += yn_counts["fn"]
+            yn_missing_pos += yn_counts["missing_pos"]
+            yn_missing_neg += yn_counts["missing_neg"]
+            yn_field['correct'] += result["yn_correct"]
+            yn_field['total'] += result["yn_total"]
+
+            # Track per-question error stats
+            for k, is_correct, match_type in result["questions"]:
+                q_stats = question_stats.get(k)
+                if q_stats is None:
+                    q_stats = question_stats[k] = {"correct": 0, "total": 0, "match_types": {}}
+                q_stats["total"] += 1
+                if is_correct:
+                    q_stats["correct"] += 1
+                if match_type:
+                    match_types = q_stats["match_types"]
+                    match_types[match_type] = match_types.get(match_type, 0) + 1
+
+            individual_results.append(detail)
+
+        # Reduce a (samples x metrics) score matrix column-wise in one pass.
+        count = len(individual_results)
+        scores = np.array(
+            [[detail[m] for m in self.SUMMARY_METRICS] for detail in individual_results],
+            dtype=np.float64,
+        ).reshape(count, len(self.SUMMARY_METRICS))
+        if count > 0:
+            means = dict(zip(self.SUMMARY_METRICS, (scores.sum(axis=0) / count).tolist()))
+        else:
+            means = dict.fromkeys(self.SUMMARY_METRICS, 0)
+
+        yn_accuracy = yn_field['correct'] / yn_field['total'] if yn_field['total'] > 0 else 0
         yn_pos_precision = yn_tp / (yn_tp + yn_fp) if (yn_tp + yn_fp) > 0 else 0.0
         yn_pos_recall = yn_tp / (yn_tp + yn_fn + yn_missing_pos) if (yn_tp + yn_fn + yn_missing_pos) > 0 else 0.0
         yn_pos_f1 = (
@@ -371,12 +477,12 @@ class OCREvaluatorV2:
         )
         yn_specificity = yn_tn / (yn_tn + yn_fp + yn_missing_neg) if (yn_tn + yn_fp + yn_missing_neg) > 0 else 0.0
         yn_balanced_acc = 0.5 * (yn_pos_recall + yn_specificity)
-        yn_positive_rate = (yn_tp + yn_fn + yn_missing_pos) / field_errors['yn_options']['total'] if field_errors['yn_options']['total'] > 0 else 0.0
+        yn_positive_rate = (yn_tp + yn_fn + yn_missing_pos) / yn_field['total'] if yn_field['total'] > 0 else 0.0
         field_analysis = {
             "yn_options": {
                 "accuracy": yn_accuracy,
-                "correct": field_errors['yn_options']['correct'],
-                "total": field_errors['yn_options']['total'],
+                "correct": yn_field['correct'],
+                "total": yn_field['total'],
                 "positive_rate": yn_positive_rate,
                 "tp": yn_tp,
                 "tn": yn_tn,
@@ -404,11 +510,11 @@ class OCREvaluatorV2:
         yn_question_stats.sort(key=lambda x: (x["accuracy"], -x["total"], x["label"]))
 
         return {
-            "avg_yn_acc": total_yn_acc / count if count > 0 else 0,
-            "avg_handwriting_cer": total_handwriting_cer / count if count > 0 else 0,
-            "avg_handwriting_wer": total_handwriting_wer / count if count > 0 else 0,
-            "avg_handwriting_ned": total_handwriting_ned / count if count > 0 else 0,
-            "avg_weighted_score": total_weighted_score / count if count > 0 else 0,
+            "avg_yn_acc": means["yn_acc"],
+            "avg_handwriting_cer": means["handwriting_cer"],
+            "avg_handwriting_wer": means["handwriting_wer"],
+            "avg_handwriting_ned": means["handwriting_ned"],
+            "avg_weighted_score": means["weighted_score"],
             "sample_count": count,
             "field_analysis": field_analysis,
             "yn_positive_rate": yn_positive_rate,
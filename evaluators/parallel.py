@@ -0,0 +1,53 @@
+"""
+Process-pool helpers for scoring large prediction lists.
+Each evaluator is shipped to a worker once via the pool initializer, so per-task
+payloads only carry the prediction chunk.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Below this many predictions, worker startup costs more than it saves.
+MIN_PARALLEL_PREDICTIONS = 64
+
+_worker_evaluator = None
+
+
+def resolve_workers(n_workers: Optional[int]) -> int:
+    """None or 0 means one worker per CPU; anything else is clamped to >= 1."""
+    if n_workers is None or n_workers == 0:
+        return os.cpu_count() or 1
+    return max(1, int(n_workers))
+
+
+def _init_worker(evaluator) -> None:
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _score_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _worker_evaluator._score_predictions(chunk)
+
+
+def score_predictions(evaluator, predictions: List[Dict[str, Any]], n_workers: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Run evaluator._score_predictions over predictions, split across processes
+    when the input is large enough. Results keep the input order.
+    """
+    predictions = list(predictions)
+    workers = min(resolve_workers(n_workers), len(predictions))
+    if workers <= 1 or len(predictions) < MIN_PARALLEL_PREDICTIONS:
+        return evaluator._score_predictions(predictions)
+
+    chunk_size = -(-len(predictions) // workers)
+    chunks = [predictions[i:i + chunk_size] for i in range(0, len(predictions), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=len(chunks),
+        initializer=_init_worker,
+        initargs=(evaluator,),
+    ) as pool:
+        for part in pool.map(_score_chunk, chunks):
+            results.extend(part)
+    return results
@@ -9,6 +9,9 @@ from typing import List, Dict, Tuple, Any
 from scipy import stats
 import warnings
 
+# Bootstrap resamples are generated and reduced in row blocks of this size.
+_BOOTSTRAP_BLOCK_ROWS = 1024
+
 
 def _default_seed() -> int:
     raw = os.getenv("OCR_BENCHMARK_SEED", "42").strip()
@@ -38,30 +41,80 @@ def bootstrap_confidence_interval(
     Returns:
         Tuple of (point_estimate, lower_bound, upper_bound)
     """
-    if not data:
-        return 0.0, 0.0, 0.0
+    return bootstrap_confidence_intervals(
+        [data],
+        confidence_level=confidence_level,
+        n_bootstrap=n_bootstrap,
+        statistic_fn=statistic_fn,
+        random_seed=random_seed,
+    )[0]
+
+
+def bootstrap_confidence_intervals(
+    data_series: List[List[float]],
+    confidence_level: float = 0.95,
+    n_bootstrap: int = 10000,
+    statistic_fn=np.mean,
+    random_seed: int = None
+) -> List[Tuple[float, float, float]]:
+    """
+    Calculate bootstrap confidence intervals for several metric series at once.
+    Series of equal length share the same resampling indices (the paired-sample
+    case), so each result matches a separate bootstrap_confidence_interval call
+    with the same seed.
     
-    data = np.array(data)
-    n = len(data)
+    Args:
+        data_series: List of metric value lists
+        confidence_level: Confidence level (default: 0.95 for 95% CI)
+        n_bootstrap: Number of bootstrap samples
+        statistic_fn: Function to compute statistic (default: mean)
+        random_seed: Seed for bootstrap sampling reproducibility.
+        
+    Returns:
+        List of (point_estimate, lower_bound, upper_bound), one per series
+    """
     seed = _default_seed() if random_seed is None else random_seed
-    rng = np.random.default_rng(seed)
-    
-    # Generate bootstrap samples
-    bootstrap_samples = rng.choice(data, size=(n_bootstrap, n), replace=True)
-    bootstrap_stats = np.apply_along_axis(statistic_fn, axis=1, arr=bootstrap_samples)
-    
-    # Calculate point estimate
-    point_estimate = statistic_fn(data)
-    
-    # Calculate confidence interval
     alpha = 1 - confidence_level
     lower_percentile = (alpha / 2) * 100
     upper_percentile = (1 - alpha / 2) * 100
-    
-    ci_lower = np.percentile(bootstrap_stats, lower_percentile)
-    ci_upper = np.percentile(bootstrap_stats, upper_percentile)
-    
-    return point_estimate, ci_lower, ci_upper
+
+    # Group series by length so each group is resampled with one index array.
+    groups: Dict[int, List[int]] = {}
+    for i, data in enumerate(data_series):
+        groups.setdefault(len(data), []).append(i)
+
+    results: List[Tuple[float, float, float]] = [(0.0, 0.0, 0.0)] * len(data_series)
+    for n, members in groups.items():
+        if n == 0:
+            continue
+        stacked = np.asarray([data_series[i] for i in members], dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        bootstrap_stats = _bootstrap_stats(stacked, n_bootstrap, statistic_fn, rng)
+        for row, i in enumerate(members):
+            point_estimate = statistic_fn(stacked[row])
+            ci_lower, ci_upper = np.percentile(bootstrap_stats[row], [lower_percentile, upper_percentile])
+            results[i] = (point_estimate, ci_lower, ci_upper)
+    return results
+
+
+def _bootstrap_stats(stacked: np.ndarray, n_bootstrap: int, statistic_fn, rng) -> np.ndarray:
+    """
+    Bootstrap statistics for each row of a (n_series, n) array.
+    Resampling indices (not values) are drawn and reduced block by block so the
+    working set stays small even for large n_bootstrap * n.
+    """
+    n = stacked.shape[1]
+    idx_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    out = np.empty((stacked.shape[0], n_bootstrap), dtype=np.float64)
+    for start in range(0, n_bootstrap, _BOOTSTRAP_BLOCK_ROWS):
+        stop = min(start + _BOOTSTRAP_BLOCK_ROWS, n_bootstrap)
+        idx = rng.integers(0, n, size=(stop - start, n), dtype=idx_dtype)
+        samples = stacked[:, idx]
+        if statistic_fn is np.mean:
+            out[:, start:stop] = samples.mean(axis=2)
+        else:
+            out[:, start:stop] = np.apply_along_axis(statistic_fn, axis=2, arr=samples)
+    return out
 
 
 def paired_t_test(
@@ -99,7 +152,7 @@ def paired_t_test(
     is_significant = p_value < 0.05
     
     # Calculate effect size (Cohen's d for paired samples)
-    differences = np.array(model1_scores) - np.array(model2_scores)
+    differences = np.asarray(model1_scores, dtype=np.float64) - np.asarray(model2_scores, dtype=np.float64)
     cohens_d = np.mean(differences) / np.std(differences, ddof=1) if np.std(differences, ddof=1) > 0 else 0
     
     return {
@@ -165,7 +218,7 @@ def wilcoxon_signed_rank_test(
     
     is_significant = p_value < 0.05
     
-    differences = np.array(model1_scores) - np.array(model2_scores)
+    differences = np.asarray(model1_scores, dtype=np.float64) - np.asarray(model2_scores, dtype=np.float64)
     
     return {
         'test': 'wilcoxon_signed_rank',
@@ -196,35 +249,69 @@ def compare_models(
     Returns:
         Dictionary with comparison results and statistics
     """
-    # Extract scores for each sample
-    model1_details = model1_results.get('details', [])
-    model2_details = model2_results.get('details', [])
-    
-    # Match samples by file_name
-    model1_dict = {item['file_name']: item for item in model1_details}
-    model2_dict = {item['file_name']: item for item in model2_details}
+    return _compare_prepared(
+        _prepare_for_compare(model1_results, metric_name),
+        _prepare_for_compare(model2_results, metric_name),
+        metric_name,
+        use_parametric
+    )
+
+
+def _prepare_for_compare(results: Dict[str, Any], metric_name: str) -> Tuple[List[str], np.ndarray, int]:
+    """
+    Extract one model's per-sample metric as a contiguous float64 array.
     
-    common_files = set(model1_dict.keys()) & set(model2_dict.keys())
+    Returns:
+        Tuple of (sorted file names, scores aligned to them, number of detail rows)
+    """
+    details = results.get('details', [])
+    by_file = {item['file_name']: item for item in details}
+    files = sorted(by_file)
+    scores = np.fromiter(
+        (by_file[f].get(metric_name, 0) for f in files),
+        dtype=np.float64,
+        count=len(files)
+    )
+    return files, scores, len(details)
+
+
+def _compare_prepared(
+    prepared1: Tuple[List[str], np.ndarray, int],
+    prepared2: Tuple[List[str], np.ndarray, int],
+    metric_name: str,
+    use_parametric: bool
+) -> Dict[str, Any]:
+    """Compare two models from _prepare_for_compare outputs, matched by file_name."""
+    files1, scores1, n_details1 = prepared1
+    files2, scores2, n_details2 = prepared2
+
+    if files1 == files2:
+        common_files = files1
+        model1_scores, model2_scores = scores1, scores2
+    else:
+        common_files = sorted(set(files1) & set(files2))
+        pos1 = {f: i for i, f in enumerate(files1)}
+        pos2 = {f: i for i, f in enumerate(files2)}
+        model1_scores = scores1[[pos1[f] for f in common_files]]
+        model2_scores = scores2[[pos2[f] for f in common_files]]
     
     if not common_files:
         return {
             'error': 'No common samples found between models',
-            'model1_samples': len(model1_details),
-            'model2_samples': len(model2_details)
+            'model1_samples': n_details1,
+            'model2_samples': n_details2
         }
     
-    model1_scores = [model1_dict[f].get(metric_name, 0) for f in sorted(common_files)]
-    model2_scores = [model2_dict[f].get(metric_name, 0) for f in sorted(common_files)]
-    
     # Perform significance test
     if use_parametric:
         test_result = paired_t_test(model1_scores, model2_scores)
     else:
         test_result = wilcoxon_signed_rank_test(model1_scores, model2_scores)
     
-    # Calculate confidence intervals for both models
-    m1_mean, m1_lower, m1_upper = bootstrap_confidence_interval(model1_scores)
-    m2_mean, m2_lower, m2_upper = bootstrap_confidence_interval(model2_scores)
+    # Calculate confidence intervals for both models (paired: shared resampling)
+    (m1_mean, m1_lower, m1_upper), (m2_mean, m2_lower, m2_upper) = bootstrap_confidence_intervals(
+        [model1_scores, model2_scores]
+    )
     
     return {
         'metric': metric_name,
@@ -232,12 +319,12 @@ def compare_models(
         'model1': {
             'mean': m1_mean,
             'ci_95': (m1_lower, m1_upper),
-            'scores': model1_scores
+            'scores': model1_scores.tolist()
         },
         'model2': {
             'mean': m2_mean,
             'ci_95': (m2_lower, m2_upper),
-            'scores': model2_scores
+            'scores': model2_scores.tolist()
         },
         'statistical_test': test_result,
         'winner': _determine_winner(m1_mean, m2_mean, test_result, metric_name)
@@ -262,12 +349,14 @@ def batch_compare_models(
     """
     model_ids = sorted(results_dict.keys())
     comparisons = []
+    # Extract each model's scores once rather than once per pair.
+    prepared = {mid: _prepare_for_compare(results_dict[mid], metric_name) for mid in model_ids}
     
     for i, model1_id in enumerate(model_ids):
         for model2_id in model_ids[i+1:]:
-            comparison = compare_models(
-                results_dict[model1_id],
-                results_dict[model2_id],
+            comparison = _compare_prepared(
+                prepared[model1_id],
+                prepared[model2_id],
                 metric_name,
                 use_parametric
             )
@@ -1,44 +1,99 @@
 import json
 import os
+import io
+import sys
 import argparse
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
 from importlib import metadata as importlib_metadata
-from models.dummy_model import DummyOCRModel
-from models.gemini_model import GeminiOCRModel
-from models.qwen_model import QwenOCRModel
-from models.openai_model import OpenAIOCRModel
-from models.ollama_model import OllamaOCRModel
 from evaluators.evaluator import OCREvaluator
 from evaluators.evaluator_v2 import OCREvaluatorV2
 from utils.prompts import DEFAULT_PROMPTS
-from utils.dataset_splits import load_splits, get_split_for_version, filter_gt_data
+from utils.dataset_splits import default_gt_path, load_splits, get_split_for_version, filter_gt_data
+from utils.json_io import dump_json, load_json, load_json_cached
 
-def _default_gt_path(eval_version: str) -> str:
-    if eval_version == "v2":
-        return "data/sample_gt_v2.json"
-    # Prefer v1-specific file if present
-    return "data/sample_gt_v1.json" if os.path.exists("data/sample_gt_v1.json") else "data/sample_gt.json"
+_STDOUT_LOCK = threading.Lock()
+
+# Datasets larger than this are read lazily per prediction instead of preloaded.
+_PRELOAD_MAX_BYTES = 1 << 30
+
+def _make_dummy(mid):
+    from models.dummy_model import DummyOCRModel
+    return DummyOCRModel()
+
+def _make_gemini(mid):
+    from models.gemini_model import GeminiOCRModel
+    return GeminiOCRModel(model_id=mid)
+
+def _make_qwen(mid):
+    from models.qwen_model import QwenOCRModel
+    return QwenOCRModel(model_id=mid)
+
+def _make_openai(mid):
+    from models.openai_model import OpenAIOCRModel
+    return OpenAIOCRModel(model_id=mid)
+
+def _make_ollama(mid):
+    from models.ollama_model import OllamaOCRModel
+    return OllamaOCRModel(model_id=mid)
+
+# Provider SDKs are imported inside each factory, only for the selected provider.
+_MODEL_FACTORIES = {
+    "dummy": _make_dummy,
+    "gemini": _make_gemini,
+    "qwen": _make_qwen,
+    "openai": _make_openai,
+    "ollama": _make_ollama,
+}
+
+def _journal_path(output_path: str) -> str:
+    """Append-only JSON Lines log written while a run is in progress."""
+    return f"{os.path.splitext(output_path)[0]}.jsonl"
 
 def _load_existing_predictions(output_path: str):
-    if not os.path.exists(output_path):
-        return []
-    try:
-        with open(output_path, 'r') as f:
-            data = json.load(f)
-        return data if isinstance(data, list) else []
-    except Exception:
-        return []
+    predictions = []
+    if os.path.exists(output_path):
+        try:
+            data = load_json(output_path)
+            predictions = data if isinstance(data, list) else []
+        except Exception:
+            predictions = []
+
+    # Merge records from an interrupted run; a crash can leave a truncated last line.
+    journal_path = _journal_path(output_path)
+    if os.path.exists(journal_path):
+        seen = {p.get("file_name") for p in predictions if isinstance(p, dict)}
+        with open(journal_path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("file_name") not in seen:
+                    seen.add(record.get("file_name"))
+                    predictions.append(record)
+    return predictions
 
 def _sort_predictions_by_gt_order(predictions, gt_data):
     """Sort predictions to match GT file order, then append unknown files."""
     gt_order = {item.get("file_name"): idx for idx, item in enumerate(gt_data)}
-    return sorted(
-        predictions,
-        key=lambda p: (
-            gt_order.get(p.get("file_name"), float("inf")),
-            str(p.get("file_name", "")),
-        ),
-    )
+    # Bucket placement is O(N); buckets keep duplicates in their original order.
+    buckets = [[] for _ in range(len(gt_data))]
+    extras = []
+    for p in predictions:
+        idx = gt_order.get(p.get("file_name"))
+        if idx is None:
+            extras.append(p)
+        else:
+            buckets[idx].append(p)
+    ordered = [p for bucket in buckets for p in bucket]
+    ordered.extend(sorted(extras, key=lambda p: str(p.get("file_name", ""))))
+    return ordered
 
 def _report_output_path(eval_version: str, model_id: str) -> str:
     safe_model_id = model_id.replace("/", "_")
@@ -81,6 +136,157 @@ def _collect_runtime_metadata(model_type: str, model_id: str):
         },
     }
 
+def _preload_images(gt_data, image_dir):
+    """Read every GT image into memory once, unless the dataset exceeds _PRELOAD_MAX_BYTES."""
+    paths = {item['file_name']: os.path.join(image_dir, item['file_name']) for item in gt_data}
+    try:
+        total_bytes = sum(os.path.getsize(path) for path in paths.values())
+    except OSError:
+        # Missing files are reported per prediction as before.
+        return {}
+    if total_bytes > _PRELOAD_MAX_BYTES:
+        print(f"ℹ️  Skipping image preload: {total_bytes / 2**20:.0f} MiB exceeds the "
+              f"{_PRELOAD_MAX_BYTES / 2**20:.0f} MiB budget.")
+        return {}
+    image_cache = {}
+    for file_name, path in paths.items():
+        with open(path, 'rb') as f:
+            image_cache[file_name] = f.read()
+    return image_cache
+
+class _ImageCache(dict):
+    """file_name -> image bytes, shared by the model ids of one invocation and filled at most once."""
+
+    attempted = False
+
+    def preload(self, gt_data, image_dir):
+        # An over-budget or incomplete dataset leaves the cache empty; don't rescan it per model id.
+        if not self.attempted:
+            self.attempted = True
+            self.update(_preload_images(gt_data, image_dir))
+
+def _predict_concurrently(model, image_dir, file_names, prompt, concurrency, image_cache=None):
+    """
+    Yield (file_name, prediction or exception) in completion order.
+    Requests are network-bound, so threads overlap their latency; results are
+    consumed on the caller's thread, so no locking is needed around them.
+    """
+    image_cache = image_cache or {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {}
+        for file_name in file_names:
+            image_bytes = image_cache.get(file_name)
+            kwargs = {"image_bytes": image_bytes} if image_bytes is not None else {}
+            future = executor.submit(model.predict, os.path.join(image_dir, file_name), prompt, **kwargs)
+            futures[future] = file_name
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def _predict_grouped(model, image_dir, file_names, prompt, concurrency, batch):
+    """
+    Yield (file_name, prediction or exception) for models with predict_many,
+    sending `batch` images per request and up to `concurrency` requests at once.
+    """
+    groups = [file_names[i:i + batch] for i in range(0, len(file_names), batch)]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(
+                model.predict_many,
+                [os.path.join(image_dir, file_name) for file_name in group],
+                prompt,
+                batch=batch,
+            ): group
+            for group in groups
+        }
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [e] * len(group)
+            yield from zip(group, results)
+
+
+def _cached_bytes_kwargs(file_names, image_cache):
+    """{"image_bytes": [...]} aligned with file_names when any are preloaded, else {}."""
+    image_bytes = [(image_cache or {}).get(file_name) for file_name in file_names]
+    return {"image_bytes": image_bytes} if any(b is not None for b in image_bytes) else {}
+
+
+def _predict_async(model, image_dir, file_names, prompt, concurrency, image_cache=None):
+    """
+    Yield (file_name, prediction or exception) in completion order for models with
+    apredict_as_completed. The whole run shares one event loop (and so one async
+    client and connection pool); results are handed back, and journaled, as each
+    request finishes.
+    """
+    image_paths = [os.path.join(image_dir, file_name) for file_name in file_names]
+    loop = asyncio.new_event_loop()
+    results = model.apredict_as_completed(
+        image_paths, prompt, concurrency=concurrency, **_cached_bytes_kwargs(file_names, image_cache)
+    )
+    done = set()
+    try:
+        while True:
+            try:
+                idx, outcome = loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+            except Exception as e:
+                # The run itself failed (e.g. the client could not be created).
+                for idx, file_name in enumerate(file_names):
+                    if idx not in done:
+                        yield file_name, e
+                break
+            done.add(idx)
+            yield file_names[idx], outcome
+    finally:
+        try:
+            loop.run_until_complete(results.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+
+
+def _select_predictor(model, batch_api, batch):
+    """
+    Pick how a run sends its requests: "batch_api" (one provider batch job),
+    "grouped" (predict_many with `batch` images per request), "async"
+    (apredict_as_completed) or "threads" (predict on a thread pool).
+    """
+    if batch_api and hasattr(model, "predict_batch"):
+        return "batch_api"
+    if batch > 1 and hasattr(model, "predict_many"):
+        return "grouped"
+    if hasattr(model, "apredict_as_completed"):
+        return "async"
+    return "threads"
+
+
+def _predict_outcomes(predictor, model, image_dir, file_names, prompt, concurrency, batch, image_cache=None):
+    """Yield (file_name, prediction or exception) using the predictor chosen by _select_predictor."""
+    if predictor == "batch_api":
+        image_paths = [os.path.join(image_dir, file_name) for file_name in file_names]
+        try:
+            batch_results = (
+                model.predict_batch(image_paths, prompt, **_cached_bytes_kwargs(file_names, image_cache))
+                if image_paths else []
+            )
+        except Exception as e:
+            batch_results = [e] * len(image_paths)
+        return zip(file_names, batch_results)
+    if predictor == "grouped":
+        return _predict_grouped(model, image_dir, file_names, prompt, concurrency, batch)
+    if predictor == "async":
+        return _predict_async(model, image_dir, file_names, prompt, concurrency, image_cache)
+    return _predict_concurrently(model, image_dir, file_names, prompt, concurrency, image_cache)
+
+
 def _is_transient_network_error(exc: Exception) -> bool:
     """Best-effort detection for transient network/provider errors."""
     msg = str(exc).lower()
@@ -141,6 +347,238 @@ def _collect_processing_stats(predictions, gt_data):
         "failed_files": sorted(failed_files),
     }
 
+@lru_cache(maxsize=8)
+def _cached_evaluator(eval_version, gt_path, gt_mtime_ns, gt_size, postprocess, n_workers):
+    # GT mtime/size are part of the key so an edited GT builds a fresh evaluator.
+    if eval_version == "v2":
+        return OCREvaluatorV2(gt_path, enable_postprocess=postprocess, n_workers=n_workers)
+    return OCREvaluator(gt_path, normalize=postprocess, n_workers=n_workers)
+
+def _get_evaluator(eval_version, gt_path, postprocess, n_workers=1):
+    """Evaluators hold no per-call state, so one per GT file and mode is reused across runs."""
+    gt_path = os.path.abspath(gt_path)
+    st = os.stat(gt_path)
+    return _cached_evaluator(eval_version, gt_path, st.st_mtime_ns, st.st_size, postprocess, n_workers)
+
+def _evaluate_and_save(
+    model_name,
+    variant_mid,
+    predictions,
+    output_path,
+    eval_version,
+    gt_path,
+    gt_data,
+    postprocess,
+    runs_per_image,
+    runtime_metadata,
+    eval_workers=1
+):
+    """Score predictions, print the console report and write report_*.json."""
+    evaluator = _get_evaluator(eval_version, gt_path, postprocess, eval_workers)
+    report = evaluator.evaluate_results(predictions)
+    if eval_version == "v2":
+        print_report_v2(model_name, report, output_path)
+    else:
+        print_report_v1(model_name, report, output_path)
+
+    report.update(_collect_processing_stats(predictions, gt_data))
+    report['model_id'] = variant_mid
+    report["postprocess_enabled"] = postprocess
+    if runs_per_image is not None:
+        report["runs_per_image"] = runs_per_image
+    report["runtime"] = runtime_metadata
+    report_path = _report_output_path(eval_version, variant_mid)
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    dump_json(report, report_path)
+    print(f"Summary report saved to: {report_path}")
+    return report
+
+def _load_gt(gt_path, eval_version, split_path):
+    """Resolve the GT path and load its items, restricted to the split when one is configured."""
+    if gt_path is None:
+        gt_path = default_gt_path(eval_version)
+    gt_data = load_json_cached(gt_path)
+    splits = load_splits(split_path)
+    split_set = get_split_for_version(splits, eval_version)
+    if split_set:
+        gt_data = filter_gt_data(gt_data, split_set)
+        print(f"🔎 Using split list: {len(gt_data)} images for {eval_version.upper()}")
+    return gt_path, gt_data
+
+def _run_single_model(
+    model_type,
+    mid,
+    eval_version,
+    gt_path,
+    gt_data,
+    prompt,
+    image_dir,
+    resume,
+    postprocess,
+    runs_per_image,
+    concurrency,
+    batch_api,
+    warmup,
+    batch,
+    evaluate,
+    image_cache,
+    eval_workers=1
+):
+    """
+    Predict, evaluate and save reports for one model id.
+    Returns the report, or None if the model could not be created or evaluate is False.
+    """
+    variant_mid = _variant_model_id(mid, postprocess)
+    safe_variant_mid = variant_mid.replace("/", "_")
+    print(f"\n🚀 Running Benchmark ({eval_version.upper()}) for Model: {mid}")
+    if not postprocess:
+        print("  🧪 Ablation mode: post-processing disabled")
+    if runs_per_image > 1:
+        print("  🔁 Multi-run mode enabled: "
+              f"{runs_per_image} runs/image (run1 will be used for dashboard-compatible outputs)")
+    
+    # Initialize Model
+    factory = _MODEL_FACTORIES.get(model_type)
+    if factory is None:
+        print(f"Unknown model type: {model_type}")
+        return None
+    try:
+        model = factory(mid)
+    except ImportError as e:
+        print(f"❌ Could not load the {model_type} adapter (missing dependency?): {e}")
+        return None
+
+    # Unrecorded calls so cold-start cost (model load on local servers, first
+    # connection setup) does not land on the first measured images.
+    if warmup > 0 and gt_data:
+        print(f"  🔥 Warming up with {warmup} unrecorded prediction(s)...")
+        warmup_path = os.path.join(image_dir, gt_data[0]['file_name'])
+        for _ in range(warmup):
+            try:
+                model.predict(warmup_path, prompt)
+            except Exception as e:
+                print(f"  ⚠️ Warmup prediction failed: {e}")
+
+    # Run Predictions (resume-capable, optionally multi-run)
+    predictor = _select_predictor(model, batch_api, batch)
+    if image_cache is not None and predictor != "grouped" and model_type != "dummy":
+        # Filled on first use and shared by the following model ids. Grouped
+        # requests send file paths and the dummy model never reads images.
+        image_cache.preload(gt_data, image_dir)
+    os.makedirs("results", exist_ok=True)
+    output_path = _pred_output_path(eval_version, safe_variant_mid)
+    run_predictions_map = {}
+    run_output_paths = {}
+
+    if runs_per_image > 1:
+        os.makedirs("results/multirun", exist_ok=True)
+
+    for run_index in range(1, runs_per_image + 1):
+        run_output_path = (
+            _multirun_pred_output_path(eval_version, safe_variant_mid, run_index)
+            if runs_per_image > 1
+            else output_path
+        )
+        predictions = _load_existing_predictions(run_output_path) if resume else []
+        # Bootstrap primary run from legacy single-run file for backwards-compatible resume.
+        if (
+            runs_per_image > 1
+            and resume
+            and run_index == 1
+            and not predictions
+            and os.path.exists(output_path)
+        ):
+            predictions = _load_existing_predictions(output_path)
+            if predictions:
+                print(f"  ♻️ Bootstrapped run {run_index} from legacy file: {output_path}")
+
+        seen_files = {p.get("file_name") for p in predictions if isinstance(p, dict)}
+        if resume and seen_files:
+            run_label = f"run {run_index}" if runs_per_image > 1 else "single run"
+            print(f"  ⏩ Resuming {run_label}: {len(seen_files)} already processed.")
+
+        if runs_per_image > 1:
+            print(f"  ▶️ Starting run {run_index}/{runs_per_image}...")
+
+        pending_files = [
+            item['file_name'] for item in gt_data
+            if not (resume and item['file_name'] in seen_files)
+        ]
+        run_tag = f"[run {run_index}] " if runs_per_image > 1 else ""
+        indent = "    " if runs_per_image > 1 else "  "
+
+        if predictor == "batch_api":
+            print(f"{indent}- {run_tag}Submitting {len(pending_files)} images as one batch job...")
+        outcomes = _predict_outcomes(
+            predictor, model, image_dir, pending_files, prompt, concurrency, batch, image_cache
+        )
+
+        # Each finished prediction is appended to a JSONL journal (O(1) per image);
+        # the consolidated JSON is written once the run completes.
+        journal_path = _journal_path(run_output_path)
+        completed = 0
+        with open(journal_path, 'a' if resume else 'w') as journal:
+            for file_name, outcome in outcomes:
+                completed += 1
+                print(f"{indent}- {run_tag}Processed {file_name} ({completed}/{len(pending_files)})")
+                if isinstance(outcome, Exception):
+                    if _is_transient_network_error(outcome):
+                        print(f"  🌐 Transient network error on {file_name} with {mid}: {outcome}")
+                        print("    ↪️ Skip recording this sample; it will be retried on next --resume run.")
+                        continue
+
+                    print(f"  ❌ Error processing {file_name} with {mid}: {outcome}")
+                    record = {
+                        "file_name": file_name,
+                        "prediction": "",
+                        "model_name": model.model_name,
+                        "failed": True,
+                        "error": str(outcome),
+                    }
+                else:
+                    record = {
+                        "file_name": file_name,
+                        "prediction": outcome,
+                        "model_name": model.model_name,
+                        "failed": False,
+                    }
+                predictions.append(record)
+                journal.write(json.dumps(record) + "\n")
+                journal.flush()
+        
+        predictions = _sort_predictions_by_gt_order(predictions, gt_data)
+        dump_json(predictions, run_output_path)
+        os.remove(journal_path)
+        run_predictions_map[run_index] = predictions
+        run_output_paths[run_index] = run_output_path
+
+    # Keep dashboard compatibility by exposing one primary run via legacy path.
+    predictions = run_predictions_map[1]
+    dump_json(predictions, output_path)
+
+    runtime_metadata = _collect_runtime_metadata(model_type=model_type, model_id=variant_mid)
+    if runs_per_image > 1:
+        meta_path = _multirun_meta_output_path(eval_version, safe_variant_mid)
+        meta_payload = {
+            "eval_version": eval_version,
+            "model_id": variant_mid,
+            "postprocess_enabled": postprocess,
+            "runs_per_image": runs_per_image,
+            "primary_pred_path": output_path,
+            "run_pred_paths": {str(k): v for k, v in run_output_paths.items()},
+            "runtime": runtime_metadata,
+        }
+        dump_json(meta_payload, meta_path)
+        print(f"Multi-run metadata saved to: {meta_path}")
+    
+    if not evaluate:
+        return None
+    return _evaluate_and_save(
+        model.model_name, variant_mid, predictions, output_path, eval_version,
+        gt_path, gt_data, postprocess, runs_per_image, runtime_metadata, eval_workers,
+    )
+
+
 def run_benchmark(
     model_type,
     model_ids,
@@ -151,233 +589,213 @@ def run_benchmark(
     resume=True,
     split_path=None,
     postprocess=True,
-    runs_per_image=1
+    runs_per_image=1,
+    concurrency=8,
+    batch_api=False,
+    warmup=0,
+    parallel_models=False,
+    batch=1,
+    evaluate=True,
+    preload=True,
+    eval_workers=1
 ):
-    # Determine default GT path if not provided
-    if gt_path is None:
-        gt_path = _default_gt_path(eval_version)
-    
     # Get prompt based on version (v2 is now format-agnostic)
     if eval_version == "v2" and schema_path:
         print("⚠️  Schema-based v2 is deprecated. Ignoring schema and using simple prompt.")
     prompt = DEFAULT_PROMPTS.get(eval_version)
     
     # Load Ground Truth
-    with open(gt_path, 'r') as f:
-        gt_data = json.load(f)
-    splits = load_splits(split_path)
-    split_set = get_split_for_version(splits, eval_version)
-    if split_set:
-        gt_data = filter_gt_data(gt_data, split_set)
-        print(f"🔎 Using split list: {len(gt_data)} images for {eval_version.upper()}")
+    gt_path, gt_data = _load_gt(gt_path, eval_version, split_path)
 
-    all_reports = []
+    if runs_per_image < 1:
+        raise ValueError("runs_per_image must be >= 1")
 
-    # Iterate over each model ID
-    for mid in model_ids:
-        variant_mid = _variant_model_id(mid, postprocess)
-        safe_variant_mid = variant_mid.replace("/", "_")
-        print(f"\n🚀 Running Benchmark ({eval_version.upper()}) for Model: {mid}")
-        if not postprocess:
-            print("  🧪 Ablation mode: post-processing disabled")
-        if runs_per_image > 1:
-            print("  🔁 Multi-run mode enabled: "
-                  f"{runs_per_image} runs/image (run1 will be used for dashboard-compatible outputs)")
-        
-        # Initialize Model
-        if model_type == "dummy":
-            model = DummyOCRModel()
-        elif model_type == "gemini":
-            model = GeminiOCRModel(model_id=mid)
-        elif model_type == "qwen":
-            model = QwenOCRModel(model_id=mid)
-        elif model_type == "openai":
-            model = OpenAIOCRModel(model_id=mid)
-        elif model_type == "ollama":
-            model = OllamaOCRModel(model_id=mid)
-        else:
-            print(f"Unknown model type: {model_type}")
-            continue
-        
-        if runs_per_image < 1:
-            raise ValueError("runs_per_image must be >= 1")
+    parallel = parallel_models and len(model_ids) > 1
+    # Images are read once for all model ids, on first use by a predictor that sends
+    # bytes (see _run_single_model); parallel workers use the per-process read cache
+    # instead, so the preloaded bytes are not pickled into every worker.
+    image_cache = _ImageCache() if preload and not parallel else None
 
-        # Run Predictions (resume-capable, optionally multi-run)
-        os.makedirs("results", exist_ok=True)
-        output_path = _pred_output_path(eval_version, safe_variant_mid)
-        run_predictions_map = {}
-        run_output_paths = {}
+    run_args = dict(
+        model_type=model_type,
+        eval_version=eval_version,
+        gt_path=gt_path,
+        gt_data=gt_data,
+        prompt=prompt,
+        image_dir=image_dir,
+        resume=resume,
+        postprocess=postprocess,
+        runs_per_image=runs_per_image,
+        concurrency=concurrency,
+        batch_api=batch_api,
+        warmup=warmup,
+        batch=batch,
+        evaluate=evaluate,
+        image_cache=image_cache,
+        eval_workers=eval_workers,
+    )
+    if parallel:
+        # Model ids share nothing (separate quotas / servers), so run them in separate
+        # processes; the benchmark then takes max(t_i) instead of sum(t_i).
+        with ProcessPoolExecutor(max_workers=len(model_ids)) as pool:
+            futures = [pool.submit(_run_single_model, mid=mid, **run_args) for mid in model_ids]
+            reports = [future.result() for future in futures]
+    else:
+        reports = [_run_single_model(mid=mid, **run_args) for mid in model_ids]
+    return [report for report in reports if report is not None]
 
-        if runs_per_image > 1:
-            os.makedirs("results/multirun", exist_ok=True)
+def evaluate_predictions(pred_path, eval_version="v1", gt_path=None, split_path=None, postprocess=True, eval_workers=1):
+    """
+    Evaluate an existing preds_*.json without calling any model, and write its report_*.json.
+    The model id is taken from the file name (preds_<version>_<model_id>.json).
+    """
+    gt_path, gt_data = _load_gt(gt_path, eval_version, split_path)
+    predictions = load_json(pred_path)
+    model_id = os.path.basename(pred_path)
+    prefix = f"preds_{eval_version}_"
+    if model_id.startswith(prefix):
+        model_id = model_id[len(prefix):]
+    model_id = os.path.splitext(model_id)[0]
+    variant_mid = model_id if (postprocess or model_id.endswith("__no_post")) else _variant_model_id(model_id, postprocess)
+    print(f"\n📊 Evaluating ({eval_version.upper()}) predictions: {pred_path}")
+    if not postprocess:
+        print("  🧪 Ablation mode: post-processing disabled")
+    # Prediction files carry no run settings, so keep the provider and runs_per_image
+    # recorded by the report being replaced (None when there is no earlier report).
+    previous = _load_previous_report(_report_output_path(eval_version, variant_mid))
+    model_type = (previous.get("runtime") or {}).get("model_type")
+    runtime_metadata = _collect_runtime_metadata(model_type=model_type, model_id=variant_mid)
+    return _evaluate_and_save(
+        model_id, variant_mid, predictions, pred_path, eval_version,
+        gt_path, gt_data, postprocess, previous.get("runs_per_image"), runtime_metadata, eval_workers,
+    )
 
-        for run_index in range(1, runs_per_image + 1):
-            run_output_path = (
-                _multirun_pred_output_path(eval_version, safe_variant_mid, run_index)
-                if runs_per_image > 1
-                else output_path
-            )
-            predictions = _load_existing_predictions(run_output_path) if resume else []
-            # Bootstrap primary run from legacy single-run file for backwards-compatible resume.
-            if (
-                runs_per_image > 1
-                and resume
-                and run_index == 1
-                and not predictions
-                and os.path.exists(output_path)
-            ):
-                predictions = _load_existing_predictions(output_path)
-                if predictions:
-                    print(f"  ♻️ Bootstrapped run {run_index} from legacy file: {output_path}")
-
-            seen_files = {p.get("file_name") for p in predictions if isinstance(p, dict)}
-            if resume and seen_files:
-                run_label = f"run {run_index}" if runs_per_image > 1 else "single run"
-                print(f"  ⏩ Resuming {run_label}: {len(seen_files)} already processed.")
-
-            if runs_per_image > 1:
-                print(f"  ▶️ Starting run {run_index}/{runs_per_image}...")
-
-            for item in gt_data:
-                file_name = item['file_name']
-                image_path = os.path.join(image_dir, file_name)
-                if resume and file_name in seen_files:
-                    continue
-                
-                if runs_per_image > 1:
-                    print(f"    - [run {run_index}] Processing {file_name}...")
-                else:
-                    print(f"  - Processing {file_name}...")
-                try:
-                    pred_text = model.predict(image_path, prompt)
-                    predictions.append({
-                        "file_name": file_name,
-                        "prediction": pred_text,
-                        "model_name": model.model_name,
-                        "failed": False,
-                    })
-                    with open(run_output_path, 'w') as f:
-                        json.dump(predictions, f, indent=2)
-                except Exception as e:
-                    if _is_transient_network_error(e):
-                        print(f"  🌐 Transient network error on {file_name} with {mid}: {e}")
-                        print("    ↪️ Skip recording this sample; it will be retried on next --resume run.")
-                        continue
+def _load_previous_report(report_path):
+    """The report at report_path as a dict, or {} if it is missing or unreadable."""
+    try:
+        report = load_json(report_path)
+    except (OSError, ValueError):
+        return {}
+    return report if isinstance(report, dict) else {}
 
-                    print(f"  ❌ Error processing {file_name} with {mid}: {e}")
-                    predictions.append({
-                        "file_name": file_name,
-                        "prediction": "",
-                        "model_name": model.model_name,
-                        "failed": True,
-                        "error": str(e),
-                    })
-                    with open(run_output_path, 'w') as f:
-                        json.dump(predictions, f, indent=2)
-            
-            predictions = _sort_predictions_by_gt_order(predictions, gt_data)
-            with open(run_output_path, 'w') as f:
-                json.dump(predictions, f, indent=2)
-            run_predictions_map[run_index] = predictions
-            run_output_paths[run_index] = run_output_path
-
-        # Keep dashboard compatibility by exposing one primary run via legacy path.
-        predictions = run_predictions_map[1]
-        with open(output_path, 'w') as f:
-            json.dump(predictions, f, indent=2)
-
-        runtime_metadata = _collect_runtime_metadata(model_type=model_type, model_id=variant_mid)
-        if runs_per_image > 1:
-            meta_path = _multirun_meta_output_path(eval_version, safe_variant_mid)
-            meta_payload = {
-                "eval_version": eval_version,
-                "model_id": variant_mid,
-                "postprocess_enabled": postprocess,
-                "runs_per_image": runs_per_image,
-                "primary_pred_path": output_path,
-                "run_pred_paths": {str(k): v for k, v in run_output_paths.items()},
-                "runtime": runtime_metadata,
-            }
-            with open(meta_path, "w") as f:
-                json.dump(meta_payload, f, indent=2)
-            print(f"Multi-run metadata saved to: {meta_path}")
-        
-        # Evaluate
-        if eval_version == "v2":
-            evaluator = OCREvaluatorV2(gt_path, enable_postprocess=postprocess)
-            report = evaluator.evaluate_results(predictions)
-            print_report_v2(model, report, output_path)
-        else:
-            evaluator = OCREvaluator(gt_path, normalize=postprocess)
-            report = evaluator.evaluate_results(predictions)
-            print_report_v1(model, report, output_path)
+def _write_report(buf):
+    """Emit a buffered report in one write so concurrent reports never interleave."""
+    with _STDOUT_LOCK:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
-        report.update(_collect_processing_stats(predictions, gt_data))
-        report['model_id'] = variant_mid
-        report["postprocess_enabled"] = postprocess
-        report["runs_per_image"] = runs_per_image
-        report["runtime"] = runtime_metadata
-        report_path = _report_output_path(eval_version, variant_mid)
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
-        print(f"Summary report saved to: {report_path}")
-        all_reports.append(report)
-    
-    return all_reports
-
-def print_report_v1(model, report, output_path):
-    print("\n" + "="*50)
-    print(f"V1 REPORT: {model.model_name}")
-    print("="*50)
-    print(f"Samples: {report['sample_count']}")
-    print(f"Failed: {report.get('failed_count', 0)} / {report.get('target_count', report['sample_count'])} ({report.get('failed_rate', 0.0):.2%})")
-    print(f"Avg CER: {report['average_cer']:.4f}")
-    print(f"Avg WER: {report['average_wer']:.4f}")
-    print("-" * 50)
-    print(f"{'File Name':<20} | {'CER':<8} | {'WER':<8}")
-    print("-" * 50)
+def print_report_v1(model_name, report, output_path):
+    buf = io.StringIO()
+    print("\n" + "="*50, file=buf)
+    print(f"V1 REPORT: {model_name}", file=buf)
+    print("="*50, file=buf)
+    print(f"Samples: {report['sample_count']}", file=buf)
+    print(f"Failed: {report.get('failed_count', 0)} / {report.get('target_count', report['sample_count'])} ({report.get('failed_rate', 0.0):.2%})", file=buf)
+    print(f"Avg CER: {report['average_cer']:.4f}", file=buf)
+    print(f"Avg WER: {report['average_wer']:.4f}", file=buf)
+    print("-" * 50, file=buf)
+    print(f"{'File Name':<20} | {'CER':<8} | {'WER':<8}", file=buf)
+    print("-" * 50, file=buf)
     for detail in report['details']:
-        print(f"{detail['file_name']:<20} | {detail['cer']:<8.4f} | {detail['wer']:<8.4f}")
-    print("="*50)
-    print(f"Full results saved to: {output_path}")
-
-def print_report_v2(model, report, output_path):
-    print("\n" + "="*70)
-    print(f"V2 REPORT: {model.model_name}")
-    print("="*70)
-    print(f"Samples: {report['sample_count']}")
-    print(f"Failed: {report.get('failed_count', 0)} / {report.get('target_count', report['sample_count'])} ({report.get('failed_rate', 0.0):.2%})")
-    print(f"Avg Y/N Acc: {report['avg_yn_acc']:.4f}")
-    print(f"Avg Handwriting CER: {report['avg_handwriting_cer']:.4f}")
-    print(f"Avg Handwriting WER: {report['avg_handwriting_wer']:.4f}")
-    print(f"Avg Handwriting NED: {report['avg_handwriting_ned']:.4f}")
-    print(f"Avg Weighted Score: {report['avg_weighted_score']:.4f}")
-    print("-" * 70)
-    print(f"{'File Name':<20} | {'YNAcc':<7} | {'CER':<7} | {'WER':<7} | {'NED':<7}")
-    print("-" * 70)
+        print(f"{detail['file_name']:<20} | {detail['cer']:<8.4f} | {detail['wer']:<8.4f}", file=buf)
+    print("="*50, file=buf)
+    print(f"Full results saved to: {output_path}", file=buf)
+    _write_report(buf)
+
+def print_report_v2(model_name, report, output_path):
+    buf = io.StringIO()
+    print("\n" + "="*70, file=buf)
+    print(f"V2 REPORT: {model_name}", file=buf)
+    print("="*70, file=buf)
+    print(f"Samples: {report['sample_count']}", file=buf)
+    print(f"Failed: {report.get('failed_count', 0)} / {report.get('target_count', report['sample_count'])} ({report.get('failed_rate', 0.0):.2%})", file=buf)
+    print(f"Avg Y/N Acc: {report['avg_yn_acc']:.4f}", file=buf)
+    print(f"Avg Handwriting CER: {report['avg_handwriting_cer']:.4f}", file=buf)
+    print(f"Avg Handwriting WER: {report['avg_handwriting_wer']:.4f}", file=buf)
+    print(f"Avg Handwriting NED: {report['avg_handwriting_ned']:.4f}", file=buf)
+    print(f"Avg Weighted Score: {report['avg_weighted_score']:.4f}", file=buf)
+    print("-" * 70, file=buf)
+    print(f"{'File Name':<20} | {'YNAcc':<7} | {'CER':<7} | {'WER':<7} | {'NED':<7}", file=buf)
+    print("-" * 70, file=buf)
     for detail in report['details']:
-        print(f"{detail['file_name']:<20} | {detail['yn_acc']:<7.2f} | {detail['handwriting_cer']:<7.2f} | {detail['handwriting_wer']:<7.2f} | {detail['handwriting_ned']:<7.2f}")
-    print("="*70)
+        print(f"{detail['file_name']:<20} | {detail['yn_acc']:<7.2f} | {detail['handwriting_cer']:<7.2f} | {detail['handwriting_wer']:<7.2f} | {detail['handwriting_ned']:<7.2f}", file=buf)
+    print("="*70, file=buf)
     if report.get("yn_question_stats"):
-        print("Top Y/N error questions (lowest accuracy):")
+        print("Top Y/N error questions (lowest accuracy):", file=buf)
         for item in report["yn_question_stats"][:10]:
-            print(f"  - {item['label']}: {item['correct']}/{item['total']} (acc={item['accuracy']:.2f})")
-    print(f"Full results saved to: {output_path}")
+            print(f"  - {item['label']}: {item['correct']}/{item['total']} (acc={item['accuracy']:.2f})", file=buf)
+    print(f"Full results saved to: {output_path}", file=buf)
+    _write_report(buf)
 
-def main():
+_COMMANDS = ("all", "predict", "evaluate")
+
+
+def _build_parser():
+    # Options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-v", "--version", type=str, default="v1", choices=["v1", "v2"], help="Evaluation version (v1=text, v2=structured)")
+    common.add_argument("--gt", type=str, default=None, help="Custom GT JSON path")
+    common.add_argument("--split", type=str, default=None, help="Optional split JSON (v1/v2 file lists)")
+    common.add_argument("--no-postprocess", action="store_true", help="Disable evaluator post-processing (ablation)")
+    common.add_argument("--eval-workers", type=int, default=1, help="Processes used to score large prediction lists (default: 1, serial; 0 = one per CPU)")
+
+    # Options for commands that call models
+    run = argparse.ArgumentParser(add_help=False)
+    run.add_argument("-m", "--model", type=str, default="dummy", choices=list(_MODEL_FACTORIES), help="Model type")
+    run.add_argument("-id", "--model_id", type=str, nargs="+", default=["gemini-2.0-flash-exp"], help="One or more Model IDs")
+    run.add_argument("-s", "--schema", type=str, default=None, help="Path to schema YAML (deprecated in V2)")
+    run.add_argument("--resume", action="store_true", help="Resume from existing predictions file")
+    run.add_argument("--no-resume", dest="resume", action="store_false", help="Disable resume")
+    run.add_argument("--runs-per-image", type=int, default=1, help="How many independent runs per image (default: 1)")
+    run.add_argument("--concurrency", type=int, default=8, help="Concurrent prediction requests per run (default: 8; match OLLAMA_NUM_PARALLEL for ollama)")
+    run.add_argument("--batch-api", action="store_true", help="Submit each run as one provider batch job when supported (openai; results may take up to 24h)")
+    run.add_argument("--warmup", type=int, default=0, help="Unrecorded warmup predictions per model before the run (default: 0)")
+    run.add_argument("--parallel-models", action="store_true", help="Run multiple model IDs in parallel processes")
+    run.add_argument("--batch", type=int, default=1, help="Images per request for models that support multi-image prompts (ollama; default: 1)")
+    run.add_argument("--no-preload", dest="preload", action="store_false", help="Read images per prediction instead of preloading them once")
+    run.set_defaults(resume=True)
+
+    # The options live only on the commands: a parent attached to both the top-level
+    # parser and a subparser lets the subparser's defaults overwrite values given
+    # before the command. _parse_args moves the command to the front instead.
     parser = argparse.ArgumentParser(description="OCR Benchmark Runner")
-    parser.add_argument("-m", "--model", type=str, default="dummy", choices=["dummy", "gemini", "qwen", "openai", "ollama"], help="Model type")
-    parser.add_argument("-id", "--model_id", type=str, nargs="+", default=["gemini-2.0-flash-exp"], help="One or more Model IDs")
-    parser.add_argument("-v", "--version", type=str, default="v1", choices=["v1", "v2"], help="Evaluation version (v1=text, v2=structured)")
-    parser.add_argument("-s", "--schema", type=str, default=None, help="Path to schema YAML (deprecated in V2)")
-    parser.add_argument("--gt", type=str, default=None, help="Custom GT JSON path")
-    parser.add_argument("--split", type=str, default=None, help="Optional split JSON (v1/v2 file lists)")
-    parser.add_argument("--resume", action="store_true", help="Resume from existing predictions file")
-    parser.add_argument("--no-resume", dest="resume", action="store_false", help="Disable resume")
-    parser.add_argument("--no-postprocess", action="store_true", help="Disable evaluator post-processing (ablation)")
-    parser.add_argument("--runs-per-image", type=int, default=1, help="How many independent runs per image (default: 1)")
-    parser.set_defaults(resume=True)
-    args = parser.parse_args()
+    commands = parser.add_subparsers(dest="command", metavar="{all,predict,evaluate}")
+    commands.add_parser("all", parents=[common, run], help="Run predictions, then evaluate (default)")
+    commands.add_parser("predict", parents=[common, run], help="Run predictions only")
+    evaluate_parser = commands.add_parser("evaluate", parents=[common], help="Evaluate existing prediction files only")
+    evaluate_parser.add_argument("--preds", type=str, nargs="+", required=True, help="One or more preds_*.json files")
+    return parser
+
+
+def _parse_args(argv=None):
+    """
+    Parse the command line. The command may appear anywhere (options before it
+    still apply); without one, the runner predicts and then evaluates (`all`).
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = next((arg for arg in argv if arg in _COMMANDS), None)
+    if command is not None:
+        argv.remove(command)
+        argv.insert(0, command)
+    elif not {"-h", "--help"} & set(argv):
+        argv.insert(0, "all")
+    return _build_parser().parse_args(argv)
+
+
+def main():
+    args = _parse_args()
+
+    if args.command == "evaluate":
+        for pred_path in args.preds:
+            evaluate_predictions(
+                pred_path,
+                eval_version=args.version,
+                gt_path=args.gt,
+                split_path=args.split,
+                postprocess=(not args.no_postprocess),
+                eval_workers=args.eval_workers
+            )
+        return
 
     run_benchmark(
         args.model,
@@ -388,7 +806,15 @@ def main():
         resume=args.resume,
         split_path=args.split,
         postprocess=(not args.no_postprocess),
-        runs_per_image=args.runs_per_image
+        runs_per_image=args.runs_per_image,
+        concurrency=args.concurrency,
+        batch_api=args.batch_api,
+        warmup=args.warmup,
+        parallel_models=args.parallel_models,
+        batch=args.batch,
+        evaluate=(args.command != "predict"),
+        preload=args.preload,
+        eval_workers=args.eval_workers
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+"""
+Asyncio helpers shared by the adapters' apredict_as_completed.
+A whole run is driven from one event loop and one async client, and results are
+handed back as each request finishes, so a slow request never holds back the rest.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Iterable
+
+
+async def iter_completed(aws: Iterable[Awaitable[Any]]) -> AsyncIterator[Any]:
+    """
+    Run awaitables as tasks and yield their results in completion order.
+    If the consumer stops early, the unfinished tasks are cancelled and awaited.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
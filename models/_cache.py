@@ -0,0 +1,102 @@
+"""
+Opt-in on-disk cache of OCR responses.
+Entries are keyed by model name, request parameters, prompt and image content, and
+stored in a SQLite file so repeated benchmark runs over the same fixtures skip paid calls.
+Enable with OCR_RESPONSE_CACHE=true; OCR_RESPONSE_CACHE_DIR overrides the location.
+With OCR_NEGATIVE_CACHE=true, requests that came back empty are remembered as well.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from models._env import _env_bool
+
+_DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ocr_benchmark")
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def response_cache_enabled() -> bool:
+    # Off by default: multi-run benchmarks need independent calls per run.
+    return _env_bool("OCR_RESPONSE_CACHE", False)
+
+
+@lru_cache(maxsize=4096)
+def _file_fingerprint(path: str, mtime_ns: int, size: int) -> str:
+    # mtime/size are part of the lru key so an edited file is re-hashed.
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def image_fingerprint(image_path: str, image_bytes: Optional[bytes] = None) -> str:
+    """
+    Content digest of an image. Files are streamed into the hash without reading
+    them into memory, and memoized per (path, mtime, size).
+    """
+    if image_bytes is not None:
+        return hashlib.blake2b(image_bytes).hexdigest()
+    st = os.stat(image_path)
+    return _file_fingerprint(image_path, st.st_mtime_ns, st.st_size)
+
+
+def negative_cache_enabled() -> bool:
+    # Empty outputs are usually model-side misses, but re-running them costs the same as a real call.
+    return _env_bool("OCR_NEGATIVE_CACHE", False)
+
+
+def response_cache_key(model_name: str, params: tuple, prompt: str, image_digest: str) -> str:
+    h = hashlib.blake2b(digest_size=32)
+    for part in (model_name, repr(params), prompt, image_digest):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory: Optional[str] = None):
+        # Expand "~" so OCR_RESPONSE_CACHE_DIR=~/... does not create a literal "./~" directory.
+        directory = os.path.expanduser(directory or os.getenv("OCR_RESPONSE_CACHE_DIR") or _DEFAULT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS empty_responses (key TEXT PRIMARY KEY)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, text: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, text) VALUES (?, ?)", (key, text))
+            self._conn.commit()
+
+    def is_known_empty(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM empty_responses WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def mark_empty(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO empty_responses (key) VALUES (?)", (key,))
+            self._conn.commit()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache instance, or None when caching is disabled."""
+    global _shared_cache
+    if not response_cache_enabled():
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,66 @@
+"""
+Shared HTTP connection pools and SDK clients for the OpenAI-compatible adapters.
+Model instances with the same settings reuse one OpenAI client and httpx pool, so
+benchmarking several model ids keeps warm keep-alive connections instead of redoing TCP/TLS setup.
+HTTP/2 is used when the optional h2 package is installed (pip install "httpx[http2]").
+"""
+import threading
+
+import httpx
+from openai import OpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # Optional; HTTP/1.1 keep-alive still avoids per-request handshakes.
+    HTTP2_AVAILABLE = False
+
+_KEEPALIVE_EXPIRY_SECONDS = 30.0
+_CONNECT_TIMEOUT_SECONDS = 10.0
+
+_shared_clients = {}
+_shared_sdk_clients = {}
+_shared_lock = threading.Lock()
+
+
+def _client_kwargs(max_connections: int, max_keepalive: int, timeout_seconds: float, http2: bool) -> dict:
+    return {
+        "http2": http2 and HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "timeout": httpx.Timeout(timeout_seconds, connect=_CONNECT_TIMEOUT_SECONDS),
+    }
+
+
+def shared_http_client(max_connections: int, max_keepalive: int, timeout_seconds: float, http2: bool = True) -> httpx.Client:
+    """Process-wide sync client for these pool settings, created on first use."""
+    key = (max_connections, max_keepalive, timeout_seconds, http2 and HTTP2_AVAILABLE)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None or client.is_closed:
+            client = DefaultHttpxClient(**_client_kwargs(max_connections, max_keepalive, timeout_seconds, http2))
+            _shared_clients[key] = client
+    return client
+
+
+def async_http_client(max_connections: int, max_keepalive: int, timeout_seconds: float, http2: bool = True) -> httpx.AsyncClient:
+    """New async client with the same pool settings (async pools are bound to one event loop)."""
+    return DefaultAsyncHttpxClient(**_client_kwargs(max_connections, max_keepalive, timeout_seconds, http2))
+
+
+def shared_openai_client(client_kwargs: dict, pool_settings: tuple) -> OpenAI:
+    """
+    Process-wide OpenAI client for these constructor kwargs (api_key, base_url,
+    timeout, max_retries) and pool settings, created on first use.
+    """
+    key = (tuple(sorted(client_kwargs.items())), tuple(pool_settings))
+    with _shared_lock:
+        client = _shared_sdk_clients.get(key)
+    if client is None:
+        client = OpenAI(**client_kwargs, http_client=shared_http_client(*pool_settings))
+        with _shared_lock:
+            client = _shared_sdk_clients.setdefault(key, client)
+    return client
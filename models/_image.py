@@ -0,0 +1,127 @@
+"""
+Image payload preparation shared by the API model adapters.
+Scans are downscaled and re-encoded as JPEG before upload, which cuts request size
+by an order of magnitude for large pages.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from models._io import _CACHE_SIZE, _data_url, _read_bytes
+
+
+def resize_ratio(w: int, h: int, max_side: int, short_side: int = 0) -> float:
+    """Downscale factor (<= 1.0) so the long side fits max_side and the short side fits short_side (0 = no limit)."""
+    ratio = 1.0
+    if max_side > 0:
+        ratio = min(ratio, max_side / float(max(w, h)))
+    if short_side > 0:
+        ratio = min(ratio, short_side / float(min(w, h)))
+    return ratio
+
+
+def prepare_image_bytes(
+    raw: bytes,
+    fallback_mime: str,
+    max_side: int = 1600,
+    quality: int = 85,
+    short_side: int = 0,
+) -> Tuple[str, bytes]:
+    """
+    Resize and JPEG-encode an image for upload. Returns (mime_type, data).
+    In-budget JPEGs are passed through untouched; if Pillow cannot decode the
+    image, the raw bytes are returned with fallback_mime.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            # Image.open only parses the header; a JPEG already within budget is sent as-is
+            # instead of paying a full decode + re-encode.
+            ratio = resize_ratio(*img.size, max_side, short_side)
+            if (
+                img.format == "JPEG"
+                and img.mode in ("RGB", "L")
+                and ratio >= 1.0
+                and img.getexif().get(0x0112, 1) == 1
+            ):
+                return "image/jpeg", raw
+            if ratio < 1.0:
+                # Let libjpeg decode at a reduced DCT scale (no-op for PNG/WebP);
+                # the LANCZOS resize below still produces the exact target size.
+                img.draft("RGB", (int(img.size[0] * ratio), int(img.size[1] * ratio)))
+            img = ImageOps.exif_transpose(img)
+            w, h = img.size
+            # The ratio only depends on the long and short side, so rotation does not change it.
+            ratio = resize_ratio(w, h, max_side, short_side)
+            if ratio < 1.0:
+                img = img.resize((max(1, int(w * ratio)), max(1, int(h * ratio))), Image.Resampling.LANCZOS)
+
+            if img.mode not in ("RGB", "L"):
+                # Flatten alpha channel to white then encode as JPEG.
+                rgb = Image.new("RGB", img.size, (255, 255, 255))
+                rgb.paste(img, mask=img.split()[-1] if "A" in img.getbands() else None)
+                img = rgb
+            elif img.mode == "L":
+                img = img.convert("RGB")
+
+            buf = io.BytesIO()
+            quality = max(30, min(95, int(quality)))
+            # Huffman optimization re-encodes the whole image for a few percent of size; skip it.
+            img.save(buf, format="JPEG", quality=quality, optimize=False, progressive=False, subsampling=2)
+            return "image/jpeg", buf.getvalue()
+    except Exception:
+        return fallback_mime, raw
+
+
+# (path, mtime_ns, fallback_mime, max_side, quality, short_side) -> (mime_type, data_url).
+# A hand-rolled LRU rather than lru_cache so already-read bytes can feed a miss
+# without becoming part of the key.
+_data_url_cache: "OrderedDict[tuple, Tuple[str, str]]" = OrderedDict()
+_data_url_lock = threading.Lock()
+
+
+def prepare_image_data_url(
+    image_path: str,
+    image_bytes: Optional[bytes] = None,
+    fallback_mime: str = "image/jpeg",
+    max_side: int = 1600,
+    quality: int = 85,
+    short_side: int = 0,
+) -> Tuple[str, str]:
+    """
+    prepare_image_bytes as a base64 data URL. Returns (mime_type, data_url).
+    Results for files on disk are memoized per (path, mtime, settings), so OCR-ing the
+    same image again (another model id, run or prompt) skips decode, resize and encode.
+    image_bytes, when given, is used on a miss instead of reading the file again.
+    """
+    try:
+        mtime_ns = os.stat(image_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    key = (image_path, mtime_ns, fallback_mime, max_side, quality, short_side)
+    if mtime_ns is not None:
+        # mtime is part of the key so an edited file is prepared again.
+        with _data_url_lock:
+            cached = _data_url_cache.get(key)
+            if cached is not None:
+                _data_url_cache.move_to_end(key)
+                return cached
+    if image_bytes is not None:
+        raw = image_bytes
+    elif mtime_ns is not None:
+        # The prepared URL is cached above, so the raw file need not stay in _read_bytes.
+        with open(image_path, "rb") as f:
+            raw = f.read()
+    else:
+        raw = _read_bytes(image_path)
+    mime_type, data = prepare_image_bytes(raw, fallback_mime, max_side, quality, short_side)
+    result = (mime_type, _data_url(mime_type, data))
+    if mtime_ns is not None:
+        with _data_url_lock:
+            _data_url_cache[key] = result
+            if len(_data_url_cache) > _CACHE_SIZE:
+                _data_url_cache.popitem(last=False)
+    return result
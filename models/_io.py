@@ -0,0 +1,50 @@
+"""
+Process-wide cached image reads shared by the model adapters.
+Benchmarking several model ids over the same images then reads and encodes
+each file once instead of once per model.
+"""
+import binascii
+import os
+from functools import lru_cache
+
+# Scanned pages are a few MB each; 256 entries keeps the cache well under a few GB.
+_CACHE_SIZE = 256
+
+# Bytes base64-encoded per step by _data_url; a multiple of 3 so blocks need no padding.
+_B64_BLOCK = 3 * 2**16
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _data_url(mime_type: str, data: bytes) -> str:
+    # The output buffer is sized up front and filled one base64 block at a time, so
+    # the full encoded image exists twice at peak (buffer and returned str) instead
+    # of three times (b64encode result, concatenated bytes, decoded str).
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    out = bytearray(len(prefix) + (len(data) + 2) // 3 * 4)
+    out[:len(prefix)] = prefix
+    pos = len(prefix)
+    view = memoryview(data)
+    for start in range(0, len(view), _B64_BLOCK):
+        encoded = binascii.b2a_base64(view[start:start + _B64_BLOCK], newline=False)
+        out[pos:pos + len(encoded)] = encoded
+        pos += len(encoded)
+    return out.decode("ascii")
+
+
+_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+}
+
+
+def _mime_type(path: str) -> str:
+    """MIME type from the file extension; unknown extensions are sent as JPEG."""
+    return _MIME.get(os.path.splitext(path)[1].lower(), "image/jpeg")
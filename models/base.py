@@ -1,18 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from models._cache import get_response_cache, image_fingerprint, negative_cache_enabled, response_cache_key
 
 class BaseOCRModel(ABC):
     def __init__(self, model_name: str):
         self.model_name = model_name
 
     @abstractmethod
-    def predict(self, image_path: str, prompt: str) -> str:
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
         """
         Perform OCR on the image with a specific prompt and return the result.
+        image_bytes, when given, is the already-read file content of image_path.
         """
         pass
 
     def get_info(self) -> Dict[str, Any]:
         return {"model_name": self.model_name}
 
+    def _cache_key(self, image_path: str, prompt: str, image_bytes: Optional[bytes], params: tuple = ()) -> Optional[str]:
+        """Response-cache key for this request, or None when the cache is disabled."""
+        if get_response_cache() is None:
+            return None
+        return response_cache_key(self.model_name, params, prompt, image_fingerprint(image_path, image_bytes))
 
+    def _cache_lookup(self, key: Optional[str]) -> Optional[str]:
+        cache = get_response_cache()
+        if key is None or cache is None:
+            return None
+        text = cache.get(key)
+        if text is None and negative_cache_enabled() and cache.is_known_empty(key):
+            return ""
+        return text
+
+    def _cache_store(self, key: Optional[str], text: str) -> None:
+        # Empty outputs are usually failures; only the opt-in negative cache remembers them.
+        cache = get_response_cache()
+        if key is None or cache is None:
+            return
+        if text:
+            cache.set(key, text)
+        elif negative_cache_enabled():
+            cache.mark_empty(key)
@@ -1,10 +1,11 @@
+from typing import Optional
 from models.base import BaseOCRModel
 
 class DummyOCRModel(BaseOCRModel):
     def __init__(self):
         super().__init__(model_name="dummy-ocr")
 
-    def predict(self, image_path: str, prompt: str) -> str:
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
         # In a real scenario, this would call an API or local model
         return "This is a dummy OCR result for " + image_path
 
@@ -1,12 +1,29 @@
 import os
+import httpx
+from functools import lru_cache
+from typing import Optional
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 from models.base import BaseOCRModel
+from models._env import _env_float
+from models._io import _CACHE_SIZE, _mime_type
 
 # Load API key from .env
 load_dotenv()
 
+@lru_cache(maxsize=_CACHE_SIZE)
+def _file_image_part(image_path: str, mtime_ns: int) -> types.Part:
+    # The SDK only reads Parts, so reusing one per image skips re-reading and
+    # re-validation when several model ids score the same file. mtime is part of
+    # the key so an image edited during a session is read again.
+    with open(image_path, "rb") as f:
+        data = f.read()
+    return types.Part.from_bytes(data=data, mime_type=_mime_type(image_path))
+
+def _image_part(image_path: str) -> types.Part:
+    return _file_image_part(image_path, os.stat(image_path).st_mtime_ns)
+
 class GeminiOCRModel(BaseOCRModel):
     def __init__(self, model_id='gemini-2.0-flash-exp'):
         # ... standard initialization ...
@@ -14,26 +31,28 @@ class GeminiOCRModel(BaseOCRModel):
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
-        self.client = genai.Client(api_key=api_key)
-
-    def predict(self, image_path: str, prompt: str) -> str:
-        with open(image_path, 'rb') as f:
-            image_bytes = f.read()
+        timeout_seconds = _env_float("GEMINI_TIMEOUT_SECONDS", 120.0)
+        # Explicit vertexai=False skips environment probing; a larger keep-alive pool
+        # lets concurrent runs reuse connections instead of re-handshaking.
+        self.client = genai.Client(
+            api_key=api_key,
+            vertexai=False,
+            http_options=types.HttpOptions(
+                timeout=int(timeout_seconds * 1000),
+                client_args={"limits": httpx.Limits(max_connections=64, max_keepalive_connections=64)},
+            ),
+        )
 
-        # Determine mime type based on extension
-        mime_type = 'image/jpeg'
-        if image_path.lower().endswith('.png'):
-            mime_type = 'image/png'
-        elif image_path.lower().endswith('.webp'):
-            mime_type = 'image/webp'
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
+        if image_bytes is None:
+            image_part = _image_part(image_path)
+        else:
+            image_part = types.Part.from_bytes(data=image_bytes, mime_type=_mime_type(image_path))
 
         response = self.client.models.generate_content(
             model=self.model_name,
             contents=[
-                types.Part.from_bytes(
-                    data=image_bytes,
-                    mime_type=mime_type,
-                ),
+                image_part,
                 prompt
             ]
         )
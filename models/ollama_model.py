@@ -1,6 +1,10 @@
+import asyncio
+import json
 import ollama
 import os
+from typing import Optional
 from models.base import BaseOCRModel
+from models._async import iter_completed
 
 class OllamaOCRModel(BaseOCRModel):
     def __init__(self, model_id='llama3.2-vision', host='http://127.0.0.1:11434'):
@@ -19,35 +23,139 @@ class OllamaOCRModel(BaseOCRModel):
         # Using Client ensures we use the correct host if OLLAMA_HOST is set differently.
         self.client = ollama.Client(host=self.host)
 
-    def predict(self, image_path: str, prompt: str) -> str:
+    def _build_messages(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None):
+        # Use absolute path for images to avoid any relative path issues
+        return [
+            {
+                'role': 'user',
+                'content': prompt,
+                'images': [image_bytes if image_bytes is not None else os.path.abspath(image_path)]
+            }
+        ]
+
+    def _extract_content(self, response) -> str:
+        content = response.get('message', {}).get('content', '')
+        
+        # Remove thinking/reasoning blocks if present
+        if "<thought>" in content and "</thought>" in content:
+            content = content.split("</thought>")[-1].strip()
+        elif "thought" in content.lower() and "\n\n" in content:
+            parts = content.split("\n\n")
+            if len(parts) > 1:
+                content = parts[-1].strip()
+                
+        return content
+
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
         try:
-            # Use absolute path for images to avoid any relative path issues
-            abs_image_path = os.path.abspath(image_path)
-            
             # Using official library
             response = self.client.chat(
                 model=self.model_name,
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': prompt,
-                        'images': [abs_image_path]
-                    }
-                ]
+                messages=self._build_messages(image_path, prompt, image_bytes)
             )
+            return self._extract_content(response)
             
-            content = response.get('message', {}).get('content', '')
-            
-            # Remove thinking/reasoning blocks if present
-            if "<thought>" in content and "</thought>" in content:
-                content = content.split("</thought>")[-1].strip()
-            elif "thought" in content.lower() and "\n\n" in content:
-                parts = content.split("\n\n")
-                if len(parts) > 1:
-                    content = parts[-1].strip()
-                    
-            return content
-            
         except Exception as e:
             print(f"  ❌ Ollama (Library) failed: {e}")
             return ""
+
+    def _parse_many(self, content: str, count: int):
+        """Map a `[{"idx": i, "text": ...}]` reply back to per-image strings, or None if unusable."""
+        text = content.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        try:
+            items = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(items, list):
+            return None
+        results = [None] * count
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get("idx")
+            if isinstance(idx, int) and 0 <= idx < count:
+                value = item.get("text", "")
+                results[idx] = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        if any(r is None for r in results):
+            return None
+        return results
+
+    def predict_many(self, image_paths, prompt: str, batch: int = 4):
+        """
+        Send up to `batch` images per chat request and split the reply per image.
+        Groups whose reply cannot be parsed are re-run one image at a time.
+        """
+        results = []
+        for start in range(0, len(image_paths), max(1, batch)):
+            group = image_paths[start:start + max(1, batch)]
+            if len(group) == 1:
+                results.append(self.predict(group[0], prompt))
+                continue
+            parsed = None
+            try:
+                response = self.client.chat(
+                    model=self.model_name,
+                    messages=[
+                        {
+                            'role': 'user',
+                            'content': (
+                                f"{prompt}\n\nYou are given {len(group)} images. Return only a JSON list "
+                                '[{"idx": <0-based image index>, "text": <the answer for that image>}] '
+                                "with one entry per image."
+                            ),
+                            'images': [os.path.abspath(p) for p in group]
+                        }
+                    ]
+                )
+                parsed = self._parse_many(self._extract_content(response), len(group))
+            except Exception as e:
+                print(f"  ❌ Ollama (Library) batched request failed: {e}")
+            if parsed is None:
+                parsed = [self.predict(p, prompt) for p in group]
+            results.extend(parsed)
+        return results
+
+    async def apredict(self, image_path: str, prompt: str, client=None, image_bytes: Optional[bytes] = None) -> str:
+        own_client = client is None
+        client = client or ollama.AsyncClient(host=self.host)
+        try:
+            response = await client.chat(
+                model=self.model_name,
+                messages=self._build_messages(image_path, prompt, image_bytes)
+            )
+            return self._extract_content(response)
+        except Exception as e:
+            print(f"  ❌ Ollama (Library) failed: {e}")
+            return ""
+        finally:
+            if own_client:
+                await _aclose(client)
+
+    async def apredict_as_completed(self, image_paths, prompt: str, concurrency: int = 4, image_bytes=None):
+        """
+        Predict several images with at most `concurrency` generations in flight.
+        The server only runs them in parallel when started with OLLAMA_NUM_PARALLEL >= concurrency.
+        image_bytes, when given, holds the already-read content per path (None entries are read from disk).
+        Yields (index into image_paths, predicted text) as each request finishes.
+        """
+        image_bytes = image_bytes or [None] * len(image_paths)
+        # One AsyncClient per run: its connection pool is bound to the running event loop.
+        client = ollama.AsyncClient(host=self.host)
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _bounded(idx, path):
+            async with sem:
+                return idx, await self.apredict(path, prompt, client=client, image_bytes=image_bytes[idx])
+
+        try:
+            async for result in iter_completed(_bounded(i, p) for i, p in enumerate(image_paths)):
+                yield result
+        finally:
+            await _aclose(client)
+
+
+async def _aclose(client) -> None:
+    # ollama.AsyncClient has no close method of its own; close its httpx pool.
+    await client._client.aclose()
@@ -1,9 +1,14 @@
 import os
+import json
+import asyncio
+import hashlib
 import time
 import random
-import base64
-import io
-from openai import OpenAI
+import re
+from contextlib import nullcontext
+from typing import Optional
+from urllib.parse import urlparse
+from openai import AsyncOpenAI
 from openai import (
     OpenAIError,
     APITimeoutError,
@@ -16,39 +21,17 @@ from openai import (
     PermissionDeniedError,
 )
 from dotenv import load_dotenv
-from PIL import Image, ImageOps
 from models.base import BaseOCRModel
+from models._env import _env_bool, _env_float, _env_int
+from models._async import iter_completed
+from models._http import async_http_client, shared_openai_client
+from models._image import prepare_image_bytes, prepare_image_data_url
+from models._io import _mime_type, _read_bytes
 
 # Load API key from .env
 load_dotenv(override=True)
 
 
-def _env_int(name: str, default: int) -> int:
-    val = os.getenv(name)
-    if val is None or val == "":
-        return default
-    try:
-        return int(val)
-    except ValueError:
-        return default
-
-
-def _env_float(name: str, default: float) -> float:
-    val = os.getenv(name)
-    if val is None or val == "":
-        return default
-    try:
-        return float(val)
-    except ValueError:
-        return default
-
-
-def _env_bool(name: str, default: bool) -> bool:
-    val = os.getenv(name)
-    if val is None or val == "":
-        return default
-    return val.strip().lower() in ("1", "true", "yes", "y", "on")
-
 def _normalize_reasoning_effort(model_name: str, configured: str) -> str:
     """
     Normalize reasoning effort against model family capabilities.
@@ -113,6 +96,60 @@ def _describe_openai_error(e: Exception) -> str:
     return f"{type(e).__name__}: {e}"
 
 
+# OpenAI vision input scaling for tile-based models (GPT-4o, GPT-4.1, o1, o3):
+# - detail=low: the model sees one 512px low-res image; keep some headroom above it.
+# - detail=high/auto: the image is fit into 2048x2048, then its short side is scaled to 768
+#   before being cut into 512px tiles.
+# Patch-based models (gpt-4.1-mini/nano, o4-mini) budget pixels differently and are left alone.
+_TILE_MODEL_PREFIXES = ("gpt-4o", "chatgpt-4o", "gpt-4.1", "o1", "o3")
+_PATCH_MODEL_PREFIXES = ("gpt-4.1-mini", "gpt-4.1-nano", "o4-mini")
+_LOW_DETAIL_MAX_SIDE = 768
+_HIGH_DETAIL_MAX_SIDE = 2048
+_HIGH_DETAIL_SHORT_SIDE = 768
+
+# 400 messages meaning the Responses endpoint (or one of its request fields) isn't served here,
+# as opposed to a problem with this particular request such as an unreadable image.
+_RESPONSES_UNSUPPORTED_RE = re.compile(
+    r"(?:unknown|unrecognized|unsupported)\s+(?:request\s+)?(?:endpoint|url|parameter|argument|field)"
+    r"|invalid url|/v1/responses|does not support (?:the )?responses",
+    re.IGNORECASE,
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _responses_unsupported(e: Exception) -> bool:
+    """True when a Responses API error says the endpoint itself is unavailable for this model/gateway."""
+    if isinstance(e, NotFoundError) or getattr(e, "status_code", None) == 405:
+        return True
+    return isinstance(e, BadRequestError) and bool(_RESPONSES_UNSUPPORTED_RE.search(str(e)))
+
+
+def _retry_after_seconds(e: Exception) -> Optional[float]:
+    # Server-suggested wait from a 429: retry-after-ms, retry-after (seconds), or
+    # x-ratelimit-reset-requests (durations like "1s", "500ms", "6m0s").
+    try:
+        headers = e.response.headers
+    except AttributeError:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return float(value) / 1000.0
+        value = headers.get("retry-after")
+        if value:
+            return float(value)
+    except ValueError:
+        pass
+    value = headers.get("x-ratelimit-reset-requests")
+    if value:
+        parts = _DURATION_PART.findall(value)
+        if parts:
+            return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+    return None
+
+
 class OpenAIOCRModel(BaseOCRModel):
     def __init__(self, model_id='gpt-4o'):
         super().__init__(model_name=model_id)
@@ -128,7 +165,6 @@ class OpenAIOCRModel(BaseOCRModel):
         self.max_attempts = _env_int("OPENAI_OCR_MAX_ATTEMPTS", 3)
         self.backoff_base = _env_float("OPENAI_RETRY_BACKOFF_SECONDS", 1.0)
         self.backoff_max = _env_float("OPENAI_RETRY_BACKOFF_MAX_SECONDS", 20.0)
-        self.backoff_jitter = _env_float("OPENAI_RETRY_BACKOFF_JITTER_SECONDS", 0.3)
         self.verbose_retries = _env_bool("OPENAI_VERBOSE_RETRIES", False)
         self.fallback_to_chat = _env_bool("OPENAI_FALLBACK_TO_CHAT", True)
         self.responses_only = _env_bool("OPENAI_RESPONSES_ONLY", True)
@@ -140,144 +176,460 @@ class OpenAIOCRModel(BaseOCRModel):
         self.reasoning_effort = _normalize_reasoning_effort(self.model_name, effort)
         detail = os.getenv("OPENAI_IMAGE_DETAIL", "low").strip().lower()
         self.image_detail = detail if detail in ("low", "high", "auto") else "low"
+        # Don't upload pixels the API would scale away for the chosen detail level.
+        self.fit_image_to_detail = (
+            _env_bool("OPENAI_IMAGE_FIT_DETAIL", True)
+            and self.model_name.startswith(_TILE_MODEL_PREFIXES)
+            and not self.model_name.startswith(_PATCH_MODEL_PREFIXES)
+        )
+        # (max_side, short_side) passed to prepare_image_bytes; 0 means no limit.
+        self._image_limits = (self.image_max_side, 0)
+        if self.fit_image_to_detail:
+            if self.image_detail == "low":
+                cap, short_side = _LOW_DETAIL_MAX_SIDE, 0
+            else:
+                cap, short_side = _HIGH_DETAIL_MAX_SIDE, _HIGH_DETAIL_SHORT_SIDE
+            max_side = min(self.image_max_side, cap) if self.image_max_side > 0 else cap
+            self._image_limits = (max_side, short_side)
+        self.batch_poll_seconds = _env_float("OPENAI_BATCH_POLL_SECONDS", 30.0)
+        # Upload each image once via the Files API and reference it by file_id
+        # instead of inlining base64 into every Responses request.
+        self.use_files_api = _env_bool("OPENAI_USE_FILES_API", False)
+        self._file_cache = {}
+        # Request fields that depend on neither prompt nor image, built once per model.
+        self._base_request = {
+            "model": self.model_name,
+            "max_output_tokens": self.max_output_tokens,
+        }
+        # GPT-5 family may spend too many tokens on reasoning and return no visible text.
+        # Keep reasoning budget low for OCR throughput and stable text output.
+        if self.model_name.startswith("gpt-5"):
+            self._base_request["reasoning"] = {"effort": self.reasoning_effort}
+
+        # "chat" once Responses has been rejected for this model and chat.completions worked.
+        self._endpoint: Optional[str] = None
 
         base_url = os.getenv("OPENAI_BASE_URL")  # optional (proxy / gateway)
         self.base_url = base_url if base_url else "https://api.openai.com/v1"
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url if base_url else None,
-            timeout=self.timeout_seconds,
-            max_retries=self.sdk_max_retries,
+        fast_timeout = _env_float("OPENAI_FAST_TIMEOUT_SECONDS", 0.0)
+        if fast_timeout > 0 and urlparse(self.base_url).hostname in ("127.0.0.1", "localhost", "::1"):
+            # A local proxy (ops/nginx-openai-proxy.conf) already cuts stalled upstream reads short;
+            # don't wait out the full timeout before retrying.
+            self.timeout_seconds = min(self.timeout_seconds, fast_timeout)
+        # Route requests that share the OCR prompt to the same server-side prompt cache.
+        # On by default only against api.openai.com: proxies and OpenAI-compatible
+        # gateways may reject the unknown field, which would fail every request.
+        self.use_prompt_cache_key = _env_bool(
+            "OPENAI_PROMPT_CACHE", urlparse(self.base_url).hostname == "api.openai.com"
+        )
+        self.prompt_cache_key_override = os.getenv("OPENAI_PROMPT_CACHE_KEY", "").strip()
+        self._prompt_cache_keys = {}
+        # Size the keep-alive pool for concurrent runs; the SDK default keeps few idle connections.
+        self.max_connections = _env_int("OPENAI_MAX_CONNECTIONS", 64)
+        self.max_keepalive = _env_int("OPENAI_MAX_KEEPALIVE", self.max_connections)
+        self.http2 = _env_bool("OPENAI_HTTP2", True)
+        self._client_kwargs = {
+            "api_key": api_key,
+            "base_url": base_url if base_url else None,
+            "timeout": self.timeout_seconds,
+            "max_retries": self.sdk_max_retries,
+        }
+        self.client = shared_openai_client(self._client_kwargs, self._pool_settings())
+
+    def _pool_settings(self) -> tuple:
+        return self.max_connections, self.max_keepalive, self.timeout_seconds, self.http2
+
+    def _async_client(self) -> AsyncOpenAI:
+        # Async connections are bound to the running event loop, so each
+        # apredict_as_completed call (one per run) gets its own client.
+        return AsyncOpenAI(
+            **self._client_kwargs,
+            http_client=async_http_client(*self._pool_settings()),
         )
 
     def _extract_responses_text(self, response) -> str:
-        def _get(obj, key, default=None):
-            if isinstance(obj, dict):
-                return obj.get(key, default)
-            return getattr(obj, key, default)
-
-        text = _get(response, "output_text", "") or ""
-        if text:
-            return text
-        # Some responses can carry text in nested output content.
+        # Batch results arrive as plain dicts, live calls as SDK objects; branch once.
         try:
-            chunks = []
-            for item in _get(response, "output", []) or []:
-                for c in _get(item, "content", []) or []:
-                    ctype = _get(c, "type", None)
-                    if ctype in ("output_text", "text"):
-                        val = _get(c, "text", None)
-                        # Some SDK variants put text under c["value"].
-                        if not val:
-                            val = _get(c, "value", None)
-                        if val:
-                            chunks.append(val)
-            return "\n".join(chunks).strip()
+            if isinstance(response, dict):
+                return self._extract_from_dict(response)
+            return self._extract_from_sdk(response)
         except Exception:
             return ""
 
-    def _prepare_image_data_url(self, image_path: str):
+    @staticmethod
+    def _extract_from_sdk(response) -> str:
+        text = getattr(response, "output_text", "") or ""
+        if text:
+            return text
+        # Some responses can carry text in nested output content.
+        # Some SDK variants put text under c.value instead of c.text.
+        return "\n".join(
+            val
+            for item in (getattr(response, "output", None) or [])
+            for c in (getattr(item, "content", None) or [])
+            if getattr(c, "type", None) in ("output_text", "text")
+            for val in (getattr(c, "text", None) or getattr(c, "value", None),)
+            if val
+        ).strip()
+
+    @staticmethod
+    def _extract_from_dict(response: dict) -> str:
+        text = response.get("output_text", "") or ""
+        if text:
+            return text
+        return "\n".join(
+            val
+            for item in (response.get("output") or [])
+            for c in (item.get("content") or [])
+            if c.get("type") in ("output_text", "text")
+            for val in (c.get("text") or c.get("value"),)
+            if val
+        ).strip()
+
+    def _prepare_image_bytes(self, image_path: str, image_bytes: Optional[bytes] = None):
         # Compress + resize image before upload to reduce latency and transport cost.
         # If Pillow decode fails, fall back to raw file bytes.
+        raw = image_bytes if image_bytes is not None else _read_bytes(image_path)
+        max_side, short_side = self._image_limits
+        return prepare_image_bytes(
+            raw,
+            _mime_type(image_path),
+            max_side=max_side,
+            quality=self.image_jpeg_quality,
+            short_side=short_side,
+        )
+
+    def _prepare_image_data_url(self, image_path: str, image_bytes: Optional[bytes] = None):
+        max_side, short_side = self._image_limits
+        return prepare_image_data_url(
+            image_path,
+            image_bytes,
+            _mime_type(image_path),
+            max_side=max_side,
+            quality=self.image_jpeg_quality,
+            short_side=short_side,
+        )
+
+    def _get_file_id(self, image_path: str, image_bytes: Optional[bytes] = None) -> str:
+        # Upload the prepared image once per (path, mtime); later requests reference it by id,
+        # and an edited image gets a fresh upload.
         try:
-            with Image.open(image_path) as img:
-                img = ImageOps.exif_transpose(img)
-                w, h = img.size
-                max_side = max(w, h)
-                if self.image_max_side > 0 and max_side > self.image_max_side:
-                    ratio = self.image_max_side / float(max_side)
-                    img = img.resize((int(w * ratio), int(h * ratio)), Image.Resampling.LANCZOS)
-
-                if img.mode not in ("RGB", "L"):
-                    # Flatten alpha channel to white then encode as JPEG.
-                    rgb = Image.new("RGB", img.size, (255, 255, 255))
-                    rgb.paste(img, mask=img.split()[-1] if "A" in img.getbands() else None)
-                    img = rgb
-                elif img.mode == "L":
-                    img = img.convert("RGB")
-
-                buf = io.BytesIO()
-                quality = max(30, min(95, int(self.image_jpeg_quality)))
-                img.save(buf, format="JPEG", quality=quality, optimize=True)
-                encoded = base64.b64encode(buf.getvalue()).decode("utf-8")
-                return "image/jpeg", f"data:image/jpeg;base64,{encoded}"
-        except Exception:
-            with open(image_path, "rb") as image_file:
-                raw = image_file.read()
-            mime_type = "image/jpeg"
-            if image_path.lower().endswith(".png"):
-                mime_type = "image/png"
-            elif image_path.lower().endswith(".webp"):
-                mime_type = "image/webp"
-            encoded = base64.b64encode(raw).decode("utf-8")
-            return mime_type, f"data:{mime_type};base64,{encoded}"
-
-    def _sleep_backoff(self, attempt_idx: int) -> None:
-        # attempt_idx: 1-based index of the *failed* attempt
-        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempt_idx - 1)))
-        delay += random.uniform(0.0, self.backoff_jitter)
-        time.sleep(delay)
+            cache_key = (image_path, os.stat(image_path).st_mtime)
+        except OSError:
+            cache_key = (image_path, None)
+        file_id = self._file_cache.get(cache_key)
+        if file_id is None:
+            mime_type, data = self._prepare_image_bytes(image_path, image_bytes)
+            stem = os.path.splitext(os.path.basename(image_path))[0]
+            name = f"{stem}.jpg" if mime_type == "image/jpeg" else os.path.basename(image_path)
+            uploaded = self._with_retries(
+                lambda: self.client.files.create(file=(name, data, mime_type), purpose="vision"),
+                "files",
+            )
+            file_id = uploaded.id
+            self._file_cache[cache_key] = file_id
+        return file_id
+
+    def _responses_image_part(self, image_path: str, image_bytes: Optional[bytes] = None) -> dict:
+        if self.use_files_api:
+            try:
+                return {
+                    "type": "input_image",
+                    "file_id": self._get_file_id(image_path, image_bytes),
+                    "detail": self.image_detail,
+                }
+            except Exception as e:
+                if self.verbose_retries:
+                    print(f"  ↪️ OpenAI file upload failed, sending inline image: {_describe_openai_error(e)}")
+        _, image_data_url = self._prepare_image_data_url(image_path, image_bytes)
+        return {
+            "type": "input_image",
+            "image_url": image_data_url,
+            "detail": self.image_detail,
+        }
+
+    def _backoff_delay(self, attempt_idx: int) -> float:
+        # attempt_idx: 1-based index of the *failed* attempt.
+        # Full jitter: spread retries over the whole window so concurrent requests don't retry in lockstep.
+        cap = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempt_idx - 1)))
+        return random.uniform(0.0, cap)
+
+    def _retry_delay(self, e: Exception, attempt: int, api_label: str) -> float:
+        # Seconds to wait before the next attempt; re-raises e when it should not be retried.
+        if isinstance(e, RateLimitError):
+            reason = "rate-limited"
+        elif isinstance(e, (APITimeoutError, APIConnectionError)):
+            reason = "timed out/connection issue"
+        elif isinstance(e, APIStatusError):
+            status = getattr(e, "status_code", None)
+            if status is None or int(status) < 500:
+                raise e
+            reason = f"server error {status}"
+        else:
+            raise e
+        if attempt >= self.max_attempts:
+            raise e
+        if self.verbose_retries:
+            print(f"  ⏳ OpenAI {api_label} {reason}; retrying (attempt {attempt}/{self.max_attempts})")
+        delay = self._backoff_delay(attempt)
+        if isinstance(e, RateLimitError):
+            # Wait out the server's reset window instead of spending attempts inside it.
+            suggested = _retry_after_seconds(e)
+            if suggested is not None:
+                delay = min(max(delay, suggested), self.backoff_max * 2)
+        return delay
 
     def _with_retries(self, fn, api_label: str):
-        last_exc = None
-        for attempt in range(1, max(1, self.max_attempts) + 1):
+        attempt = 1
+        while True:
             try:
                 return fn()
-            except RateLimitError as e:
-                last_exc = e
-                if attempt >= self.max_attempts:
-                    raise
-                if self.verbose_retries:
-                    print(f"  ⏳ OpenAI {api_label} rate-limited; retrying (attempt {attempt}/{self.max_attempts})")
-                self._sleep_backoff(attempt)
-            except (APITimeoutError, APIConnectionError) as e:
-                last_exc = e
-                if attempt >= self.max_attempts:
-                    raise
-                if self.verbose_retries:
-                    print(f"  ⏳ OpenAI {api_label} timed out/connection issue; retrying (attempt {attempt}/{self.max_attempts})")
-                self._sleep_backoff(attempt)
-            except APIStatusError as e:
-                last_exc = e
-                status = getattr(e, "status_code", None)
-                retryable = status is not None and int(status) >= 500
-                if (not retryable) or attempt >= self.max_attempts:
-                    raise
-                if self.verbose_retries:
-                    print(f"  ⏳ OpenAI {api_label} server error {status}; retrying (attempt {attempt}/{self.max_attempts})")
-                self._sleep_backoff(attempt)
             except Exception as e:
-                last_exc = e
-                raise
-        if last_exc:
-            raise last_exc
-
-    def predict(self, image_path: str, prompt: str) -> str:
-        _, image_data_url = self._prepare_image_data_url(image_path)
-
-        def _call_responses():
-            request = {
-                "model": self.model_name,
-                "max_output_tokens": self.max_output_tokens,
-                "input": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "input_text", "text": prompt},
-                            {
-                                "type": "input_image",
-                                "image_url": image_data_url,
-                                "detail": self.image_detail,
-                            },
-                        ],
-                    }
-                ],
-            }
-            # GPT-5 family may spend too many tokens on reasoning and return no visible text.
-            # Keep reasoning budget low for OCR throughput and stable text output.
-            if self.model_name.startswith("gpt-5"):
-                request["reasoning"] = {"effort": self.reasoning_effort}
-            return self.client.responses.create(**request)
+                time.sleep(self._retry_delay(e, attempt, api_label))
+            attempt += 1
+
+    async def _awith_retries(self, fn, api_label: str):
+        # Same policy as _with_retries for coroutine functions.
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, api_label))
+            attempt += 1
+
+    def _prompt_cache_key(self, prompt: str) -> str:
+        if self.prompt_cache_key_override:
+            return self.prompt_cache_key_override
+        key = self._prompt_cache_keys.get(prompt)
+        if key is None:
+            key = hashlib.sha1(f"{self.model_name}\n{prompt}".encode("utf-8")).hexdigest()[:32]
+            self._prompt_cache_keys[prompt] = key
+        return key
+
+    def _build_responses_request(self, prompt: str, image_part: dict) -> dict:
+        request = {
+            **self._base_request,
+            "input": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "input_text", "text": prompt},
+                        image_part,
+                    ],
+                }
+            ],
+        }
+        # The fixed prompt text stays the first content block so the cached prefix lines up.
+        if self.use_prompt_cache_key:
+            request["prompt_cache_key"] = self._prompt_cache_key(prompt)
+        return request
+
+    def predict_batch(self, image_paths, prompt: str, image_bytes=None) -> list:
+        """
+        Run all images through one Batch API job (/v1/responses, 24h window).
+        image_bytes, when given, holds the already-read content per path (None entries are read from disk).
+        Returns one entry per path, in order: the predicted text, or an Exception
+        for requests that failed inside the batch.
+        """
+        image_bytes = image_bytes or [None] * len(image_paths)
+        lines = []
+        for idx, (image_path, raw) in enumerate(zip(image_paths, image_bytes)):
+            lines.append(json.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": self._build_responses_request(prompt, self._responses_image_part(image_path, raw)),
+            }))
+        batch_input = self._with_retries(
+            lambda: self.client.files.create(
+                file=("ocr_batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch",
+            ),
+            "files",
+        )
+        batch = self._with_retries(
+            lambda: self.client.batches.create(
+                input_file_id=batch_input.id,
+                endpoint="/v1/responses",
+                completion_window="24h",
+            ),
+            "batches",
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.batch_poll_seconds)
+            batch = self._with_retries(lambda: self.client.batches.retrieve(batch.id), "batches")
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status={batch.status}")
+
+        results = [RuntimeError("missing from OpenAI batch output")] * len(lines)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = self._with_retries(lambda: self.client.files.content(file_id).text, "files")
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                idx = int(record["custom_id"])
+                response = record.get("response") or {}
+                status = response.get("status_code")
+                if record.get("error") or status != 200:
+                    detail = record.get("error") or response.get("body")
+                    results[idx] = RuntimeError(f"OpenAI batch request failed (status={status}): {detail}")
+                else:
+                    results[idx] = self._extract_responses_text(response.get("body") or {})
+        return results
+
+    def _cache_params(self) -> tuple:
+        # Everything that changes the model's output belongs in the cache key.
+        return (
+            self.image_detail,
+            self.max_output_tokens,
+            self.reasoning_effort,
+            self.image_max_side,
+            self.image_jpeg_quality,
+            self.fit_image_to_detail,
+        )
+
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
+        key = self._cache_key(image_path, prompt, image_bytes, self._cache_params())
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        text = self._predict_uncached(image_path, prompt, image_bytes)
+        self._cache_store(key, text)
+        return text
+
+    async def apredict(self, image_path: str, prompt: str, client=None, image_bytes: Optional[bytes] = None) -> str:
+        if client is None:
+            async with self._async_client() as client:
+                return await self._apredict(client, image_path, prompt, image_bytes, nullcontext())
+        return await self._apredict(client, image_path, prompt, image_bytes, nullcontext())
+
+    async def _apredict(self, client, image_path: str, prompt: str, image_bytes: Optional[bytes], request_slot) -> str:
+        key = self._cache_key(image_path, prompt, image_bytes, self._cache_params())
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        text = await self._apredict_uncached(client, image_path, prompt, image_bytes, request_slot)
+        self._cache_store(key, text)
+        return text
+
+    async def apredict_as_completed(self, image_paths, prompt: str, concurrency: int = 16, image_bytes=None):
+        """
+        Predict all images concurrently over one shared AsyncOpenAI client.
+        image_bytes, when given, holds the already-read content per path (None entries are read from disk).
+        Yields (index into image_paths, predicted text or the Exception raised) as each request finishes.
+        """
+        image_bytes = image_bytes or [None] * len(image_paths)
+        concurrency = max(1, concurrency)
+        sem = asyncio.Semaphore(concurrency)
+        # Up to `concurrency` more images are prepared while every request slot is busy,
+        # so decode/resize/encode of the next images overlaps with requests in flight.
+        ahead = asyncio.Semaphore(2 * concurrency)
+        async with self._async_client() as client:
+            async def _bounded(idx, path):
+                async with ahead:
+                    try:
+                        return idx, await self._apredict(client, path, prompt, image_bytes[idx], sem)
+                    except Exception as e:
+                        return idx, e
+
+            async for result in iter_completed(_bounded(i, p) for i, p in enumerate(image_paths)):
+                yield result
+
+    def _predict_uncached(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
+        if self._endpoint == "chat":
+            return self._predict_chat(image_path, prompt, {}, image_bytes)
+        image_part = self._responses_image_part(image_path, image_bytes)
+        request = self._build_responses_request(prompt, image_part)
+
+        # Prefer Responses API. In responses-only mode, never fall back to chat.completions.
+        rejected = False
+        try:
+            response = self._with_retries(lambda: self.client.responses.create(**request), "responses")
+        except Exception as e:
+            text = self._on_responses_error(e)
+            rejected = _responses_unsupported(e)
+        else:
+            text = self._responses_text(response)
+        if text is not None:
+            return text
+        text = self._predict_chat(image_path, prompt, image_part, image_bytes)
+        self._maybe_pin_chat(rejected, text)
+        return text
+
+    async def _apredict_uncached(self, client, image_path: str, prompt: str, image_bytes: Optional[bytes], request_slot) -> str:
+        # request_slot bounds the network part only; image preparation runs before it is acquired.
+        if self._endpoint == "chat":
+            async with request_slot:
+                return await asyncio.to_thread(self._predict_chat, image_path, prompt, {}, image_bytes)
+        # Image preparation is CPU-bound (and may upload via the sync client); keep it off the event loop.
+        image_part = await asyncio.to_thread(self._responses_image_part, image_path, image_bytes)
+        request = self._build_responses_request(prompt, image_part)
+
+        async with request_slot:
+            rejected = False
+            try:
+                response = await self._awith_retries(lambda: client.responses.create(**request), "responses")
+            except Exception as e:
+                text = self._on_responses_error(e)
+                rejected = _responses_unsupported(e)
+            else:
+                text = self._responses_text(response)
+            if text is not None:
+                return text
+            text = await asyncio.to_thread(self._predict_chat, image_path, prompt, image_part, image_bytes)
+        self._maybe_pin_chat(rejected, text)
+        return text
+
+    def _maybe_pin_chat(self, responses_rejected: bool, chat_text: str) -> None:
+        # Responses was rejected as unsupported (unknown endpoint/parameter, 404/405) but
+        # chat.completions answered: this model/gateway doesn't serve Responses, so skip the
+        # failing round-trip on later images. Other 400s (e.g. one bad image) never pin.
+        if responses_rejected and chat_text and self._endpoint != "chat":
+            self._endpoint = "chat"
+            if self.verbose_retries:
+                print(f"  ↪️ Using chat.completions for all further {self.model_name} requests.")
+
+    def _responses_text(self, response) -> Optional[str]:
+        # Text of a Responses API result, or None when the caller should fall back to chat.completions.
+        text = self._extract_responses_text(response)
+        if text:
+            return text
+        if not self.responses_only:
+            return None
+        if self.verbose_retries:
+            # Help diagnose model/endpoint behavior differences quickly.
+            output_items = getattr(response, "output", None)
+            if output_items is None and isinstance(response, dict):
+                output_items = response.get("output")
+            item_types = []
+            if isinstance(output_items, list):
+                for it in output_items[:3]:
+                    if isinstance(it, dict):
+                        item_types.append(it.get("type"))
+                    else:
+                        item_types.append(getattr(it, "type", None))
+            print(f"  ⚠️ OpenAI responses returned empty text in responses-only mode (output_types={item_types}).")
+        return ""
+
+    def _on_responses_error(self, e: Exception) -> Optional[str]:
+        # Raise or return "" for a failed Responses call, or None to fall back to chat.completions.
+        if self.responses_only or (not self.fallback_to_chat):
+            msg = _describe_openai_error(e)
+            print(f"  ❌ OpenAI responses failed: {msg}")
+            if self.raise_on_error:
+                raise RuntimeError(f"OpenAI responses failed: {msg}") from e
+            return ""
+        if self.verbose_retries:
+            print(f"  ↪️ Falling back to chat.completions after responses error: {_describe_openai_error(e)}")
+        return None
+
+    def _predict_chat(self, image_path: str, prompt: str, image_part: dict, image_bytes: Optional[bytes] = None) -> str:
+        # Chat Completions cannot reference uploaded files, so always send the image inline.
+        chat_image_url = image_part.get("image_url") or self._prepare_image_data_url(image_path, image_bytes)[1]
 
         def _call_chat() -> str:
             response = self.client.chat.completions.create(
@@ -289,7 +641,7 @@ class OpenAIOCRModel(BaseOCRModel):
                             {"type": "text", "text": prompt},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": image_data_url, "detail": self.image_detail},
+                                "image_url": {"url": chat_image_url, "detail": self.image_detail},
                             },
                         ],
                     }
@@ -299,49 +651,6 @@ class OpenAIOCRModel(BaseOCRModel):
                 return response.choices[0].message.content or ""
             return ""
 
-        # Prefer Responses API. In responses-only mode, never fall back to chat.completions.
-        try:
-            response = self._with_retries(_call_responses, "responses")
-            text = self._extract_responses_text(response)
-            if text:
-                return text
-            if self.responses_only:
-                if self.verbose_retries:
-                    # Help diagnose model/endpoint behavior differences quickly.
-                    output_items = getattr(response, "output", None)
-                    if output_items is None and isinstance(response, dict):
-                        output_items = response.get("output")
-                    item_types = []
-                    if isinstance(output_items, list):
-                        for it in output_items[:3]:
-                            if isinstance(it, dict):
-                                item_types.append(it.get("type"))
-                            else:
-                                item_types.append(getattr(it, "type", None))
-                    print(f"  ⚠️ OpenAI responses returned empty text in responses-only mode (output_types={item_types}).")
-                return ""
-        except (BadRequestError, NotFoundError) as e:
-            if self.responses_only or (not self.fallback_to_chat):
-                msg = _describe_openai_error(e)
-                print(f"  ❌ OpenAI responses failed: {msg}")
-                if self.raise_on_error:
-                    raise RuntimeError(f"OpenAI responses failed: {msg}") from e
-                return ""
-            if self.verbose_retries:
-                print(f"  ↪️ Falling back to chat.completions after responses error: {_describe_openai_error(e)}")
-        except Exception as e:
-            if self.responses_only or (not self.fallback_to_chat):
-                msg = _describe_openai_error(e)
-                print(f"  ❌ OpenAI responses failed: {msg}")
-                if self.raise_on_error:
-                    raise RuntimeError(f"OpenAI responses failed: {msg}") from e
-                return ""
-            if self.verbose_retries:
-                print(f"  ↪️ Falling back to chat.completions after responses error: {_describe_openai_error(e)}")
-
-        # Chat Completions API
-        if self.responses_only:
-            return ""
         try:
             return self._with_retries(_call_chat, "chat.completions")
         except Exception as e:
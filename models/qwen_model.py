@@ -1,8 +1,14 @@
 import os
-import base64
-from openai import OpenAI
+import asyncio
+from typing import Optional
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from models.base import BaseOCRModel
+from models._env import _env_int
+from models._async import iter_completed
+from models._http import async_http_client, shared_openai_client
+from models._image import prepare_image_data_url
+from models._io import _data_url, _mime_type, _read_bytes
 
 # Load API key from .env
 load_dotenv()
@@ -14,24 +20,74 @@ class QwenOCRModel(BaseOCRModel):
         if not api_key:
             raise ValueError("DASHSCOPE_API_KEY not found in environment variables.")
         
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
-        )
+        self._client_kwargs = {
+            "api_key": api_key,
+            "base_url": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+        }
+        # Same pool sizing as the OpenAI adapter; 600s matches the SDK's default read timeout.
+        self._pool_settings = (64, 64, 600.0)
+        self.client = shared_openai_client(self._client_kwargs, self._pool_settings)
+        # DashScope bills vision input by pixels too; downscale scans before upload (0 = send as-is).
+        self.image_max_side = _env_int("QWEN_IMAGE_MAX_SIDE", 1280)
+
+    def predict(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
+        key = self._cache_key(image_path, prompt, image_bytes, (self.image_max_side,))
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        text = self._predict_uncached(image_path, prompt, image_bytes)
+        self._cache_store(key, text)
+        return text
+
+    async def apredict(self, image_path: str, prompt: str, client=None, image_bytes: Optional[bytes] = None) -> str:
+        key = self._cache_key(image_path, prompt, image_bytes, (self.image_max_side,))
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        # Image preparation is CPU-bound; keep it off the event loop.
+        request = await asyncio.to_thread(self._build_request, image_path, prompt, image_bytes)
+        if client is None:
+            async with AsyncOpenAI(**self._client_kwargs, http_client=async_http_client(*self._pool_settings)) as client:
+                response = await client.chat.completions.create(**request)
+        else:
+            response = await client.chat.completions.create(**request)
+        text = response.choices[0].message.content if response.choices else ""
+        self._cache_store(key, text)
+        return text
 
-    def predict(self, image_path: str, prompt: str) -> str:
-        # Read and encode image to base64
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+    async def apredict_as_completed(self, image_paths, prompt: str, concurrency: int = 16, image_bytes=None):
+        """
+        Predict all images concurrently over one shared AsyncOpenAI client.
+        image_bytes, when given, holds the already-read content per path (None entries are read from disk).
+        Yields (index into image_paths, predicted text or the Exception raised) as each request finishes.
+        """
+        image_bytes = image_bytes or [None] * len(image_paths)
+        sem = asyncio.Semaphore(max(1, concurrency))
+        async with AsyncOpenAI(**self._client_kwargs, http_client=async_http_client(*self._pool_settings)) as client:
+            async def _bounded(idx, path):
+                async with sem:
+                    try:
+                        return idx, await self.apredict(path, prompt, client=client, image_bytes=image_bytes[idx])
+                    except Exception as e:
+                        return idx, e
 
-        # Determine mime type
-        mime_type = 'image/jpeg'
-        if image_path.lower().endswith('.png'):
-            mime_type = 'image/png'
-        elif image_path.lower().endswith('.webp'):
-            mime_type = 'image/webp'
+            async for result in iter_completed(_bounded(i, p) for i, p in enumerate(image_paths)):
+                yield result
+
+    def _predict_uncached(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> str:
+        response = self.client.chat.completions.create(**self._build_request(image_path, prompt, image_bytes))
+        return response.choices[0].message.content if response.choices else ""
 
-        response = self.client.chat.completions.create(
+    def _build_request(self, image_path: str, prompt: str, image_bytes: Optional[bytes] = None) -> dict:
+        mime_type = _mime_type(image_path)
+
+        # Downscale/compress, then encode to a base64 data URL
+        if self.image_max_side > 0:
+            _, image_url = prepare_image_data_url(image_path, image_bytes, mime_type, max_side=self.image_max_side)
+        else:
+            image_url = _data_url(mime_type, image_bytes if image_bytes is not None else _read_bytes(image_path))
+
+        return dict(
             model=self.model_name,
             messages=[
                 {
@@ -40,7 +96,7 @@ class QwenOCRModel(BaseOCRModel):
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:{mime_type};base64,{base64_image}"
+                                "url": image_url
                             },
                         },
                         {"type": "text", "text": prompt},
@@ -52,5 +108,3 @@ class QwenOCRModel(BaseOCRModel):
             # Keeping it simple for now to match Gemini's output.
         )
 
-        return response.choices[0].message.content if response.choices else ""
-
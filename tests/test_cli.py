@@ -0,0 +1,33 @@
+import unittest
+
+import main
+
+
+class ParseArgsTests(unittest.TestCase):
+    def test_options_before_command_are_kept(self):
+        args = main._parse_args(["-v", "v2", "evaluate", "--preds", "f.json"])
+        self.assertEqual(args.command, "evaluate")
+        self.assertEqual(args.version, "v2")
+        self.assertEqual(args.preds, ["f.json"])
+        self.assertEqual(args.eval_workers, 1)
+
+    def test_command_after_model_ids_is_not_a_model_id(self):
+        args = main._parse_args(["-m", "openai", "-id", "gpt-4o", "predict"])
+        self.assertEqual(args.command, "predict")
+        self.assertEqual(args.model, "openai")
+        self.assertEqual(args.model_id, ["gpt-4o"])
+
+    def test_no_command_runs_all(self):
+        args = main._parse_args(["-v", "v2", "-m", "dummy", "-id", "x", "--concurrency", "3"])
+        self.assertEqual(args.command, "all")
+        self.assertEqual(args.version, "v2")
+        self.assertEqual(args.model_id, ["x"])
+        self.assertEqual(args.concurrency, 3)
+
+    def test_eval_workers_opt_in(self):
+        args = main._parse_args(["--eval-workers", "0", "predict"])
+        self.assertEqual(args.eval_workers, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,13 @@ import os
 import tempfile
 import unittest
 
+import numpy as np
+
 from evaluators.evaluator import OCREvaluator
 from evaluators.evaluator_v2 import OCREvaluatorV2
 from evaluators.metrics import calculate_cer, calculate_ned, calculate_wer
-from evaluators.statistical_tests import bootstrap_confidence_interval
+from evaluators.statistical_tests import bootstrap_confidence_interval, bootstrap_confidence_intervals
+from utils.normalization import normalize_text
 
 
 def _write_temp_json(data):
@@ -29,6 +32,28 @@ class MetricsTests(unittest.TestCase):
         second = bootstrap_confidence_interval(data, n_bootstrap=500, random_seed=7)
         self.assertEqual(first, second)
 
+    def test_bootstrap_ci_brackets_point_estimate(self):
+        data = [0.0, 0.25, 0.5, 0.75, 1.0] * 10
+        for fn in (np.mean, np.median):
+            point, lower, upper = bootstrap_confidence_interval(
+                data, n_bootstrap=2500, statistic_fn=fn, random_seed=3
+            )
+            self.assertLessEqual(lower, point)
+            self.assertLessEqual(point, upper)
+
+    def test_batched_bootstrap_matches_single_series(self):
+        series = [[0.1, 0.4, 0.9, 0.3], [0.2, 0.2, 0.8, 0.5], [0.6, 0.7]]
+        batched = bootstrap_confidence_intervals(series, n_bootstrap=1500, random_seed=11)
+        for data, result in zip(series, batched):
+            self.assertEqual(result, bootstrap_confidence_interval(data, n_bootstrap=1500, random_seed=11))
+
+
+class NormalizationTests(unittest.TestCase):
+    def test_noise_phrases_and_checkbox_marks(self):
+        self.assertEqual(normalize_text("Handwritten note: (x) yes [ ] no"), "Y YES N NO")
+        self.assertEqual(normalize_text("Recognized Text:\n中 文\t字"), "中文字")
+        self.assertEqual(normalize_text("A-1, b_2!", strict_semantic=True), "A1B2")
+
 
 class EvaluatorV1Tests(unittest.TestCase):
     def test_empty_prediction_is_still_counted(self):
@@ -44,6 +69,24 @@ class EvaluatorV1Tests(unittest.TestCase):
         self.assertEqual(report["average_cer"], 1.0)
         self.assertEqual(report["average_wer"], 1.0)
 
+    def test_parallel_scoring_matches_serial(self):
+        gt_path = _write_temp_json([
+            {"file_name": f"{i}.png", "text": f"LINE {i} TEXT"} for i in range(80)
+        ])
+        self.addCleanup(lambda: os.remove(gt_path))
+        predictions = [
+            {"file_name": f"{i}.png", "prediction": f"LINE {i % 7} TEXT"} for i in range(80)
+        ]
+
+        serial = OCREvaluator(gt_path, n_workers=1).evaluate_results(predictions)
+        parallel = OCREvaluator(gt_path, n_workers=2).evaluate_results(predictions)
+        self.assertEqual(serial, parallel)
+
+    def test_scoring_is_serial_by_default(self):
+        gt_path = _write_temp_json([{"file_name": "a.png", "text": "ABC"}])
+        self.addCleanup(lambda: os.remove(gt_path))
+        self.assertEqual(OCREvaluator(gt_path).n_workers, 1)
+
 
 class EvaluatorV2Tests(unittest.TestCase):
     def test_postprocess_enables_key_and_yn_normalization(self):
@@ -69,6 +112,19 @@ class EvaluatorV2Tests(unittest.TestCase):
         self.assertEqual(report["avg_handwriting_cer"], 0.0)
         self.assertEqual(report["avg_weighted_score"], 1.0)
 
+    def test_embedded_key_phrases_map_in_key_mapping_order(self):
+        gt_path = _write_temp_json([])
+        self.addCleanup(lambda: os.remove(gt_path))
+        evaluator = OCREvaluatorV2(gt_path, enable_postprocess=True)
+
+        # "结核病" precedes "结核病 (肺癆)" in KEY_MAPPING, so it is replaced first and
+        # "(肺癆)" stays behind; reports depend on this, so keep it.
+        self.assertEqual(evaluator._normalize_key_variants("5. 结核病 (肺癆)"), ("TB肺癆", "TB"))
+        self.assertEqual(
+            evaluator._normalize_key_variants("病历 心脏病"),
+            evaluator._normalize_key_variants("MEDICAL HISTORY Heart Disease"),
+        )
+
     def test_no_postprocess_requires_strict_yn_format(self):
         gt_path = _write_temp_json([
             {
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+
+
+class _GroupingModel:
+    """Fake adapter that supports both multi-image and async prediction."""
+
+    def __init__(self):
+        self.model_name = "fake-grouping"
+        self.groups = []
+
+    def predict(self, image_path, prompt, image_bytes=None):
+        raise AssertionError("single-image predict should not be used with --batch")
+
+    def predict_many(self, image_paths, prompt, batch=4):
+        self.groups.append([os.path.basename(p) for p in image_paths])
+        return [f"text for {os.path.basename(p)}" for p in image_paths]
+
+    async def apredict_as_completed(self, image_paths, prompt, concurrency=4):
+        raise AssertionError("apredict_as_completed should not be used with --batch")
+        yield
+
+
+class _AsyncModel:
+    """Fake async adapter whose first image finishes last."""
+
+    def __init__(self):
+        self.loops = set()
+        self.image_bytes = None
+
+    async def apredict_as_completed(self, image_paths, prompt, concurrency=4, image_bytes=None):
+        self.image_bytes = image_bytes
+
+        async def _one(idx, path):
+            self.loops.add(asyncio.get_running_loop())
+            await asyncio.sleep(0.05 if idx == 0 else 0)
+            if idx == 2:
+                return idx, ValueError("bad image")
+            return idx, f"text for {os.path.basename(path)}"
+
+        for next_done in asyncio.as_completed([_one(i, p) for i, p in enumerate(image_paths)]):
+            yield await next_done
+
+
+class RunnerDispatchTests(unittest.TestCase):
+    def test_batch_uses_predict_many_before_async(self):
+        model = _GroupingModel()
+        gt_data = [{"file_name": f"{i}.png"} for i in range(5)]
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(workdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        with mock.patch.dict(main._MODEL_FACTORIES, {"fake": lambda mid: model}):
+            main._run_single_model(
+                "fake", "fake-grouping", "v1", None, gt_data, "prompt", "data/",
+                resume=False, postprocess=True, runs_per_image=1, concurrency=1,
+                batch_api=False, warmup=0, batch=2, evaluate=False, image_cache={},
+            )
+
+        self.assertEqual(model.groups, [["0.png", "1.png"], ["2.png", "3.png"], ["4.png"]])
+        predictions = main.load_json(main._pred_output_path("v1", "fake-grouping"))
+        self.assertEqual(
+            [(p["file_name"], p["prediction"]) for p in predictions],
+            [(f"{i}.png", f"text for {i}.png") for i in range(5)],
+        )
+
+    def test_predictor_selection_order(self):
+        model = _GroupingModel()
+        self.assertEqual(main._select_predictor(model, batch_api=False, batch=2), "grouped")
+        self.assertEqual(main._select_predictor(model, batch_api=False, batch=1), "async")
+
+    def test_async_yields_in_completion_order_on_one_loop(self):
+        model = _AsyncModel()
+        file_names = [f"{i}.png" for i in range(12)]
+        outcomes = list(main._predict_async(model, "data/", file_names, "prompt", concurrency=4))
+
+        self.assertEqual(len(model.loops), 1)
+        self.assertEqual(outcomes[-1], ("0.png", "text for 0.png"))
+        self.assertCountEqual([name for name, _ in outcomes], file_names)
+        self.assertIsInstance(dict(outcomes)["2.png"], ValueError)
+
+    def test_async_receives_preloaded_bytes(self):
+        model = _AsyncModel()
+        file_names = ["0.png", "1.png"]
+        list(main._predict_async(model, "data/", file_names, "prompt", 2, image_cache={"1.png": b"raw"}))
+        self.assertEqual(model.image_bytes, [None, b"raw"])
+
+        list(main._predict_async(model, "data/", file_names, "prompt", 2, image_cache={}))
+        self.assertIsNone(model.image_bytes)
+
+    def test_preload_is_attempted_once(self):
+        cache = main._ImageCache()
+        with mock.patch.object(main, "_preload_images", return_value={}) as preload:
+            cache.preload([{"file_name": "a.png"}], "data/")
+            cache.preload([{"file_name": "a.png"}], "data/")
+        preload.assert_called_once()
+        self.assertEqual(cache, {})
+
+
+class EvaluateCommandTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(workdir.name)
+        self.addCleanup(os.chdir, cwd)
+        main.dump_json([{"file_name": "a.png", "text": "ABC"}], "gt.json")
+        main.dump_json([{"file_name": "a.png", "prediction": "ABC"}], "preds_v1_x.json")
+
+    def test_evaluate_creates_results_dir(self):
+        report = main.evaluate_predictions("preds_v1_x.json", gt_path="gt.json")
+        self.assertTrue(os.path.exists("results/report_v1_x.json"))
+        self.assertIsNone(report["runtime"]["model_type"])
+
+    def test_evaluate_keeps_run_settings_of_previous_report(self):
+        os.makedirs("results")
+        main.dump_json(
+            {"runs_per_image": 3, "runtime": {"model_type": "openai"}}, "results/report_v1_x.json"
+        )
+        report = main.evaluate_predictions("preds_v1_x.json", gt_path="gt.json")
+        self.assertEqual(report["runs_per_image"], 3)
+        self.assertEqual(report["runtime"]["model_type"], "openai")
+
+
+if __name__ == "__main__":
+    unittest.main()
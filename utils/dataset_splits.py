@@ -1,45 +1,50 @@
-import json
 import os
-from typing import Dict, List, Optional, Set, Any
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional
+
+from utils.json_io import load_json
 
 DEFAULT_SPLIT_PATH = "data/dataset_split.json"
 
-def load_splits(split_path: Optional[str] = None) -> Optional[Dict[str, List[str]]]:
+def default_gt_path(version: str) -> str:
+    if version == "v2":
+        return "data/sample_gt_v2.json"
+    # Prefer v1-specific file if present
+    return "data/sample_gt_v1.json" if os.path.exists("data/sample_gt_v1.json") else "data/sample_gt.json"
+
+def load_splits(split_path: Optional[str] = None) -> Optional[Dict[str, FrozenSet[str]]]:
+    """Load the split file as {"v1": frozenset(file names), "v2": ...}; None if unavailable."""
     path = split_path
     if not path and os.path.exists(DEFAULT_SPLIT_PATH):
         path = DEFAULT_SPLIT_PATH
     if not path or not os.path.exists(path):
         return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json(path)
         if not isinstance(data, dict):
             return None
         splits = {}
         for key in ("v1", "v2"):
             value = data.get(key, [])
             if isinstance(value, list):
-                splits[key] = [str(v) for v in value if v]
+                splits[key] = frozenset(str(v) for v in value if v)
             else:
-                splits[key] = []
+                splits[key] = frozenset()
         return splits
     except Exception:
         return None
 
-def get_split_for_version(splits: Optional[Dict[str, List[str]]], version: str) -> Optional[Set[str]]:
+def get_split_for_version(splits: Optional[Dict[str, FrozenSet[str]]], version: str) -> Optional[FrozenSet[str]]:
     if not splits:
         return None
-    files = splits.get(version)
-    if not isinstance(files, list) or not files:
-        return None
-    return set(files)
+    # The set is built once in load_splits and shared by every caller.
+    return splits.get(version) or None
 
-def filter_gt_data(gt_data: List[Dict[str, Any]], split_set: Optional[Set[str]]) -> List[Dict[str, Any]]:
+def filter_gt_data(gt_data: List[Dict[str, Any]], split_set: Optional[AbstractSet[str]]) -> List[Dict[str, Any]]:
     if not split_set:
         return gt_data
     return [item for item in gt_data if item.get("file_name") in split_set]
 
-def filter_file_names(file_names: List[str], split_set: Optional[Set[str]]) -> List[str]:
+def filter_file_names(file_names: List[str], split_set: Optional[AbstractSet[str]]) -> List[str]:
     if not split_set:
         return file_names
     return [name for name in file_names if name in split_set]
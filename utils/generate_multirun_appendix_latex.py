@@ -271,6 +271,7 @@ def collect_checkbox_rows() -> Tuple[List[dict], float, int, int, int]:
     positive_rate = (pos / total) if total else 0.0
 
     grouped: Dict[str, List[dict]] = defaultdict(list)
+    evaluator = OCREvaluatorV2(gt_path, enable_postprocess=True)
     for path in sorted(glob.glob("results/multirun/preds_v2_*__run*.json")):
         name = os.path.basename(path)
         model_with_run = name[len("preds_v2_"):-len(".json")]
@@ -278,7 +279,7 @@ def collect_checkbox_rows() -> Tuple[List[dict], float, int, int, int]:
         if str(base_model_id(model_id)).startswith("dummy"):
             continue
         preds = load_json(path)
-        report = OCREvaluatorV2(gt_path, enable_postprocess=True).evaluate_results(preds)
+        report = evaluator.evaluate_results(preds)
         yn_stats = report["field_analysis"]["yn_options"]
         grouped[base_model_id(model_id)].append(
             {
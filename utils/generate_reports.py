@@ -3,19 +3,20 @@
 Batch generate report_*.json from existing preds_*.json files.
 Usage: python utils/generate_reports.py [--version v1|v2|all]
 """
-import json
 import os
 import sys
 import glob
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to Python path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 sys.path.insert(0, project_root)
 
-from evaluators.evaluator import OCREvaluator
-from evaluators.evaluator_v2 import OCREvaluatorV2
+from evaluators.parallel import resolve_workers
+from utils.dataset_splits import default_gt_path
+from utils.json_io import dump_json, load_json
 
 def _collect_processing_stats(predictions, gt_dict):
     gt_files = set(gt_dict.keys())
@@ -39,34 +40,67 @@ def _collect_processing_stats(predictions, gt_dict):
         "failed_files": sorted(failed_files),
     }
 
-def get_gt_path(version):
+def _build_evaluator(version, gt_path, no_postprocess, n_workers=1):
+    # Evaluators pull in numpy; import them only once there is something to score.
     if version == "v2":
-        return "data/sample_gt_v2.json"
-    return "data/sample_gt_v1.json" if os.path.exists("data/sample_gt_v1.json") else "data/sample_gt.json"
+        from evaluators.evaluator_v2 import OCREvaluatorV2
+        return OCREvaluatorV2(gt_path, enable_postprocess=(not no_postprocess), n_workers=n_workers)
+    from evaluators.evaluator import OCREvaluator
+    return OCREvaluator(gt_path, normalize=(not no_postprocess), n_workers=n_workers)
 
-def generate_reports_for_version(version, no_postprocess=False):
+# Per-process evaluator used by report workers, built once by the pool initializer.
+_worker_evaluator = None
+
+def _init_report_worker(version, gt_path, no_postprocess):
+    global _worker_evaluator
+    # Files are already spread across processes, so each evaluator scores serially.
+    _worker_evaluator = _build_evaluator(version, gt_path, no_postprocess, n_workers=1)
+
+def _write_report(evaluator, job):
+    """Evaluate one prediction file and write its report. Returns (generated, message)."""
+    pred_file, report_path, output_model_id, tagged_pred_path, no_postprocess = job
+    try:
+        predictions = load_json(pred_file)
+
+        if not predictions:
+            return False, f"  ⚠️  Empty predictions: {pred_file}"
+
+        # Evaluate
+        report = evaluator.evaluate_results(predictions)
+        report.update(_collect_processing_stats(predictions, evaluator.gt_dict))
+        report['model_id'] = output_model_id
+        report['postprocess_enabled'] = (not no_postprocess)
+
+        # Save report
+        dump_json(report, report_path)
+
+        # Duplicate predictions file for dashboard detailed-view compatibility.
+        if tagged_pred_path and not os.path.exists(tagged_pred_path):
+            dump_json(predictions, tagged_pred_path)
+
+        return True, f"  ✅ Generated: {report_path}"
+    except Exception as e:
+        return False, f"  ❌ Error processing {pred_file}: {e}"
+
+def _write_report_in_worker(job):
+    return _write_report(_worker_evaluator, job)
+
+def generate_reports_for_version(version, no_postprocess=False, workers=1):
     mode = "no-postprocess ablation" if no_postprocess else "default"
     print(f"\n🔄 Generating reports for {version.upper()} ({mode})...")
     
-    gt_path = get_gt_path(version)
+    gt_path = default_gt_path(version)
     if not os.path.exists(gt_path):
         print(f"  ⚠️  Ground truth not found: {gt_path}")
         return 0
     
-    # Initialize evaluator
-    evaluator = (
-        OCREvaluatorV2(gt_path, enable_postprocess=(not no_postprocess))
-        if version == "v2"
-        else OCREvaluator(gt_path, normalize=(not no_postprocess))
-    )
-    
     # Find all prediction files
     pred_files = sorted(glob.glob(f"results/preds_{version}_*.json"))
     if not pred_files:
         print(f"  ℹ️  No prediction files found for {version.upper()}")
         return 0
     
-    count = 0
+    jobs = []
     for pred_file in pred_files:
         model_id = os.path.basename(pred_file).replace(f"preds_{version}_", "").replace(".json", "")
         if no_postprocess:
@@ -77,45 +111,41 @@ def generate_reports_for_version(version, no_postprocess=False):
         else:
             output_model_id = model_id
         report_path = f"results/report_{version}_{model_id}.json"
+        tagged_pred_path = None
         if no_postprocess:
             report_path = f"results/report_{version}_{output_model_id}.json"
+            tagged_pred_path = f"results/preds_{version}_{output_model_id}.json"
         
         # Skip if report already exists
         if os.path.exists(report_path):
             print(f"  ⏭️  Report exists: {report_path}")
             continue
-        
-        # Load predictions
-        try:
-            with open(pred_file, 'r') as f:
-                predictions = json.load(f)
-            
-            if not predictions:
-                print(f"  ⚠️  Empty predictions: {pred_file}")
-                continue
-            
-            # Evaluate
-            report = evaluator.evaluate_results(predictions)
-            report.update(_collect_processing_stats(predictions, evaluator.gt_dict))
-            report['model_id'] = output_model_id
-            report['postprocess_enabled'] = (not no_postprocess)
-            
-            # Save report
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2)
-
-            # Duplicate predictions file for dashboard detailed-view compatibility.
-            if no_postprocess:
-                tagged_pred_path = f"results/preds_{version}_{output_model_id}.json"
-                if not os.path.exists(tagged_pred_path):
-                    with open(tagged_pred_path, 'w') as pf:
-                        json.dump(predictions, pf, indent=2)
-            
-            print(f"  ✅ Generated: {report_path}")
-            count += 1
-            
-        except Exception as e:
-            print(f"  ❌ Error processing {pred_file}: {e}")
+        jobs.append((pred_file, report_path, output_model_id, tagged_pred_path, no_postprocess))
+
+    # One process per prediction file; a single file hands the requested workers to
+    # the evaluator's own per-prediction parallelism instead.
+    requested = workers
+    workers = min(resolve_workers(workers), len(jobs))
+    if workers <= 1:
+        evaluator = _build_evaluator(version, gt_path, no_postprocess, n_workers=requested) if jobs else None
+        outcomes = (_write_report(evaluator, job) for job in jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_report_worker,
+            initargs=(version, gt_path, no_postprocess),
+        )
+        outcomes = pool.map(_write_report_in_worker, jobs)
+
+    count = 0
+    try:
+        for generated, message in outcomes:
+            print(message)
+            count += generated
+    finally:
+        if pool is not None:
+            pool.shutdown()
     
     return count
 
@@ -133,6 +163,12 @@ def main():
         action="store_true",
         help="Generate ablation reports without evaluator post-processing"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to evaluate prediction files (default: 1, serial; 0 = one per CPU)"
+    )
     args = parser.parse_args()
     
     # Change to project root directory
@@ -141,9 +177,9 @@ def main():
     
     total = 0
     if args.version in ("v1", "all"):
-        total += generate_reports_for_version("v1", no_postprocess=args.no_postprocess)
+        total += generate_reports_for_version("v1", no_postprocess=args.no_postprocess, workers=args.workers)
     if args.version in ("v2", "all"):
-        total += generate_reports_for_version("v2", no_postprocess=args.no_postprocess)
+        total += generate_reports_for_version("v2", no_postprocess=args.no_postprocess, workers=args.workers)
     
     print(f"\n✨ Done! Generated {total} report(s).")
 
@@ -0,0 +1,61 @@
+"""
+JSON file helpers.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is always available.
+    orjson = None
+
+
+def load_json(path: str) -> Any:
+    """Parse a UTF-8 JSON file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=16)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    # mtime/size are part of the lru key so an edited file is parsed again.
+    return load_json(path)
+
+
+def load_json_cached(path: str) -> Any:
+    """
+    load_json memoized per (absolute path, mtime, size), for files such as the GT
+    that are read once per model/evaluator. Treat the result as read-only: it is
+    shared between callers.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _load_json_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def dump_json(obj: Any, path: str, ensure_ascii: bool = True) -> None:
+    """
+    Write obj as 2-space indented JSON (UTF-8). orjson always writes non-ASCII
+    text as-is; ensure_ascii=False makes the stdlib fallback do the same.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # Fall back to the stdlib for types orjson rejects (e.g. float subclasses).
+            data = None
+        if data is not None:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=ensure_ascii, indent=2)
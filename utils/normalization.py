@@ -2,6 +2,41 @@ import re
 import unicodedata
 import string
 
+# Model-specific descriptive noise, removed case-insensitively in a single pass.
+_NOISE_RE = re.compile(
+    '|'.join([
+        r'handwritten note:',
+        r'handwritten:',
+        r'\[redacted\]',
+        r'note:',
+        r'caption this image',
+        r'recognized text:',
+    ]),
+    re.IGNORECASE,
+)
+# Selected mark variants.
+_SELECTED_MARK_RE = re.compile(r'[\(\[\{][XVV\u2713\u2714][\)\]\}]')
+# Unselected blank box variants.
+_UNSELECTED_MARK_RE = re.compile(r'[\(\[\{]\s*[\)\]\}]')
+_CJK_SPACE_RE = re.compile(r'(?<=[\u4e00-\u9fff])\s+(?=[\u4e00-\u9fff])')
+_NON_ALNUM_RE = re.compile(r'[^A-Z0-9]')
+
+# Bound methods, resolved once at import instead of per call in the hot path.
+_unicode_normalize = unicodedata.normalize
+_strip_noise = _NOISE_RE.sub
+_mark_selected = _SELECTED_MARK_RE.sub
+_mark_unselected = _UNSELECTED_MARK_RE.sub
+_join_cjk = _CJK_SPACE_RE.sub
+_strip_non_alnum = _NON_ALNUM_RE.sub
+
+_CJK_PUNCTUATION = r"""！"#$%&'()*+,-./:;<=>?@[\]^_`{|}~“”‘’〈〉《》「」『』【】〔〕〖〗〽〰〾〿–—‘’“”„‟†‡•‥…‰′″‹›※‼‽‾‿⁀⁁⁂⁃"""
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation + _CJK_PUNCTUATION)
+# Deletes every ASCII char outside A-Z0-9; used instead of _NON_ALNUM_RE for ASCII text.
+_STRICT_ASCII_TABLE = dict.fromkeys(
+    c for c in range(128) if chr(c) not in string.ascii_uppercase + string.digits
+)
+
+
 def normalize_text(text: str, remove_punctuation: bool = True, strict_semantic: bool = False) -> str:
     """
     Highly robust normalization for OCR benchmark to focus on semantic content.
@@ -10,48 +45,38 @@ def normalize_text(text: str, remove_punctuation: bool = True, strict_semantic:
     if not text:
         return ""
     
+    # ASCII input (most English OCR output) is already NFKC-normal and has no
+    # CJK runs, so steps 1 and 5 are skipped for it.
+    is_ascii = text.isascii()
+
     # 1) Unicode NFKC normalization.
-    text = unicodedata.normalize('NFKC', text)
+    if not is_ascii:
+        text = _unicode_normalize('NFKC', text)
     
     # 2) Remove model-specific descriptive noise (case-insensitive).
-    noise_patterns = [
-        r'handwritten note:', 
-        r'handwritten:', 
-        r'\[redacted\]', 
-        r'note:', 
-        r'caption this image',
-        r'recognized text:'
-    ]
-    for pattern in noise_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _strip_noise('', text)
 
     # 3) Uppercase for case-insensitive matching.
     text = text.upper()
 
     # 4) Symbol semantic mapping: normalize common checkbox marks to Y/N.
-    # Selected mark variants.
-    text = re.sub(r'[\(\[\{][XVV\u2713\u2714][\)\]\}]', ' Y ', text)
-    # Unselected blank box variants.
-    text = re.sub(r'[\(\[\{]\s*[\)\]\}]', ' N ', text)
+    text = _mark_selected(' Y ', text)
+    text = _mark_unselected(' N ', text)
     
     # 5) Remove spaces between adjacent CJK characters.
-    text = re.sub(r'(?<=[\u4e00-\u9fff])\s+(?=[\u4e00-\u9fff])', '', text)
+    if not is_ascii:
+        text = _join_cjk('', text)
     
-    # 6) Flatten newlines and extra whitespace.
-    text = text.replace('\n', ' ')
-    
-    # 7) Remove punctuation noise (including bracket wrappers around Y/N marks).
+    # 6) Remove punctuation noise (including bracket wrappers around Y/N marks).
     if remove_punctuation or strict_semantic:
-        cjk_punctuation = r"""！"#$%&'()*+,-./:;<=>?@[\]^_`{|}~“”‘’〈〉《》「」『』【】〔〕〖〗〽〰〾〿–—‘’“”„‟†‡•‥…‰′″‹›※‼‽‾‿⁀⁁⁂⁃"""
-        all_punct = string.punctuation + cjk_punctuation
-        table = str.maketrans('', '', all_punct)
-        text = text.translate(table)
+        text = text.translate(_PUNCT_TABLE)
 
-    # 8) Strict semantic mode: keep only alphanumeric chars.
+    # 7) Strict semantic mode: keep only alphanumeric chars.
     if strict_semantic:
-        text = re.sub(r'[^A-Z0-9]', '', text)
+        if text.isascii():
+            text = text.translate(_STRICT_ASCII_TABLE)
+        else:
+            text = _strip_non_alnum('', text)
 
-    # 9) Final cleanup.
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    # 8) Flatten newlines and collapse whitespace runs (str.split also trims the ends).
+    return ' '.join(text.split())
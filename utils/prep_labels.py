@@ -1,17 +1,16 @@
 import os
-import json
-import glob
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add project root to sys.path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from models.gemini_model import GeminiOCRModel
 from utils.prompts import DEFAULT_PROMPTS
 from utils.dataset_splits import load_splits, get_split_for_version, filter_file_names
+from utils.json_io import dump_json, load_json
 
 def _load_gt_file_names(gt_path: str):
     if not gt_path:
@@ -20,39 +19,80 @@ def _load_gt_file_names(gt_path: str):
         print(f"⚠️  GT file not found: {gt_path}. Falling back to image folder scan.")
         return None
     try:
-        with open(gt_path, 'r', encoding='utf-8') as f:
-            gt_data = json.load(f)
+        gt_data = load_json(gt_path)
         return [item.get("file_name") for item in gt_data if item.get("file_name")]
     except Exception as e:
         print(f"⚠️  Failed to read GT file: {e}. Falling back to image folder scan.")
         return None
 
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.webp'})
+
+# Progress is rewritten whole, so flush it every few images instead of per image.
+PROGRESS_FLUSH_EVERY = 20
+
 def _load_progress(progress_path: str):
+    """Load progress with "completed" as a set (stored on disk as a sorted list)."""
     if not os.path.exists(progress_path):
-        return {"completed": [], "failed": {}}
+        return {"completed": set(), "failed": {}}
     try:
-        with open(progress_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(progress_path)
         if not isinstance(data, dict):
-            return {"completed": [], "failed": {}}
-        data.setdefault("completed", [])
+            return {"completed": set(), "failed": {}}
+        data["completed"] = set(data.get("completed", []))
         data.setdefault("failed", {})
         return data
     except Exception:
-        return {"completed": [], "failed": {}}
+        return {"completed": set(), "failed": {}}
 
 def _save_progress(progress_path: str, progress: dict):
     tmp_path = progress_path + ".tmp"
-    with open(tmp_path, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    dump_json({**progress, "completed": sorted(progress["completed"])}, tmp_path, ensure_ascii=False)
     os.replace(tmp_path, progress_path)
 
-def prep_labels(version="v1", gt_path=None, image_dir="data", split_path=None):
+def _write_draft(model, img_path: str, prompt: str, version: str, label_dir: str, label_file: str):
+    """Ask the model for a draft of one image and write it as an editable Markdown label."""
+    file_name = os.path.basename(img_path)
+    prediction = model.predict(img_path, prompt)
+
+    # Clean up prediction if it contains markdown code blocks
+    clean_pred = prediction
+    _, sep, rest = clean_pred.partition("```json")
+    if not sep:
+        _, sep, rest = clean_pred.partition("```")
+    if sep:
+        clean_pred = rest.partition("```")[0].strip()
+
+    rel_img_path = os.path.relpath(img_path, label_dir)
+
+    if version == "v2":
+        content = f"""# Labeling V2: {file_name}
+![{file_name}]({rel_img_path})
+
+---
+### Ground Truth (Edit below)
+```json
+{clean_pred}
+```
+"""
+    else:
+        content = f"""# Labeling V1: {file_name}
+![{file_name}]({rel_img_path})
+
+---
+### Ground Truth (Edit below)
+{prediction}
+"""
+    with open(label_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def prep_labels(version="v1", gt_path=None, image_dir="data", split_path=None, concurrency=8):
     """
     Calls Gemini to draft OCR results and saves them as Markdown files for human editing.
     """
     prompt = DEFAULT_PROMPTS.get(version)
-    
+
+    # google-genai is slow to import; load it only when drafting actually starts.
+    from models.gemini_model import GeminiOCRModel
     try:
         model = GeminiOCRModel(model_id='gemini-3-flash-preview')
     except Exception as e:
@@ -71,69 +111,65 @@ def prep_labels(version="v1", gt_path=None, image_dir="data", split_path=None):
         gt_file_names = filter_file_names(gt_file_names, split_set)
         image_files = [os.path.join(image_dir, fn) for fn in gt_file_names]
     else:
-        extensions = ['*.png', '*.jpg', '*.jpeg', '*.webp']
+        # One directory read, filtered by extension (and split) per entry.
         image_files = []
-        for ext in extensions:
-            image_files.extend(glob.glob(os.path.join(image_dir, ext)))
-        if split_set:
-            image_files = [p for p in image_files if os.path.basename(p) in split_set]
+        with os.scandir(image_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                    continue
+                if split_set and entry.name not in split_set:
+                    continue
+                if entry.is_file():
+                    image_files.append(os.path.join(image_dir, entry.name))
+        image_files.sort()
 
     if split_set:
         print(f"🔎 Using split list: {len(image_files)} images for {version.upper()}")
 
-    for img_path in image_files:
-        file_name = os.path.basename(img_path)
-        label_file = os.path.join(label_dir, f"{file_name}.md")
-
-        if os.path.exists(label_file):
-            print(f"⏩ Skipping {file_name}, label file already exists.")
-            if file_name not in progress["completed"]:
-                progress["completed"].append(file_name)
-                _save_progress(progress_path, progress)
-            continue
-
-        print(f"🤖 Gemini is drafting ({version.upper()}) for {file_name}...")
-        try:
-            prediction = model.predict(img_path, prompt)
-            
-            # Clean up prediction if it contains markdown code blocks
-            clean_pred = prediction
-            if "```json" in clean_pred:
-                clean_pred = clean_pred.split("```json")[1].split("```")[0].strip()
-            elif "```" in clean_pred:
-                clean_pred = clean_pred.split("```")[1].split("```")[0].strip()
-            
-            rel_img_path = os.path.relpath(img_path, label_dir)
-            
-            if version == "v2":
-                content = f"""# Labeling V2: {file_name}
-![{file_name}]({rel_img_path})
-
----
-### Ground Truth (Edit below)
-```json
-{clean_pred}
-```
-"""
+    # Number of progress changes not yet written to disk.
+    unsaved = 0
+    try:
+        # Read the label folder once instead of stat()ing each label file.
+        with os.scandir(label_dir) as entries:
+            existing_labels = {entry.name for entry in entries if entry.name.endswith(".md")}
+        to_draft = []
+        for img_path in image_files:
+            file_name = os.path.basename(img_path)
+            label_file = os.path.join(label_dir, f"{file_name}.md")
+            if f"{file_name}.md" in existing_labels:
+                print(f"⏩ Skipping {file_name}, label file already exists.")
+                if file_name not in progress["completed"]:
+                    progress["completed"].add(file_name)
+                    unsaved += 1
             else:
-                content = f"""# Labeling V1: {file_name}
-![{file_name}]({rel_img_path})
+                to_draft.append((img_path, file_name, label_file))
 
----
-### Ground Truth (Edit below)
-{prediction}
-"""
-            with open(label_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"✅ Draft created: {label_file}")
-            if file_name not in progress["completed"]:
-                progress["completed"].append(file_name)
-            if file_name in progress["failed"]:
-                progress["failed"].pop(file_name, None)
-            _save_progress(progress_path, progress)
-        except Exception as e:
-            print(f"❌ Error drafting {file_name}: {e}")
-            progress["failed"][file_name] = str(e)
+        # Drafting is network-bound, so threads overlap the Gemini round trips.
+        # Progress is only touched on this thread as drafts complete.
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {}
+            for img_path, file_name, label_file in to_draft:
+                print(f"🤖 Gemini is drafting ({version.upper()}) for {file_name}...")
+                future = executor.submit(_write_draft, model, img_path, prompt, version, label_dir, label_file)
+                futures[future] = (file_name, label_file)
+            for future in as_completed(futures):
+                file_name, label_file = futures[future]
+                try:
+                    future.result()
+                    print(f"✅ Draft created: {label_file}")
+                    progress["completed"].add(file_name)
+                    progress["failed"].pop(file_name, None)
+                except Exception as e:
+                    print(f"❌ Error drafting {file_name}: {e}")
+                    progress["failed"][file_name] = str(e)
+                unsaved += 1
+
+                if unsaved >= PROGRESS_FLUSH_EVERY:
+                    _save_progress(progress_path, progress)
+                    unsaved = 0
+    finally:
+        # Also runs on Ctrl-C or an unexpected error, so finished drafts are recorded.
+        if unsaved:
             _save_progress(progress_path, progress)
 
 if __name__ == "__main__":
@@ -142,5 +178,12 @@ if __name__ == "__main__":
     parser.add_argument("--gt", type=str, default=None, help="Optional GT JSON path to limit images")
     parser.add_argument("--image_dir", type=str, default="data", help="Image folder (default: data)")
     parser.add_argument("--split", type=str, default=None, help="Optional split JSON (v1/v2 file lists)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent Gemini drafting requests (default: 8)")
     args = parser.parse_args()
-    prep_labels(version=args.version, gt_path=args.gt, image_dir=args.image_dir, split_path=args.split)
+    prep_labels(
+        version=args.version,
+        gt_path=args.gt,
+        image_dir=args.image_dir,
+        split_path=args.split,
+        concurrency=args.concurrency,
+    )
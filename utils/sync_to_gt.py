@@ -9,6 +9,8 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
+from utils.json_io import dump_json
+
 def sync_to_gt(version="v1"):
     """
     Reads edited Markdown files and syncs them back to the appropriate GT JSON.
@@ -54,8 +56,7 @@ def sync_to_gt(version="v1"):
                     results.append({"file_name": file_name, "text": raw_text})
 
     results.sort(key=lambda x: x.get('file_name', ''))
-    with open(gt_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    dump_json(results, gt_path, ensure_ascii=False)
     print(f"🚀 Synced {len(results)} {version.upper()} labels to {gt_path}")
 
 if __name__ == "__main__":